@@ -1,16 +1,21 @@
 import streamlit as st
 import yaml
 import os
+import time
 import pandas as pd
-from src.components.json_loader import load_intents
+from src.components.schema_registry import SchemaRegistry
+from src.components.entity_validator import validate_result
 from src.components.gemma_nlu import GemmaNLU
 from src.components.gemini_nlu import GeminiNLU
+from src.components.qwen_nlu import QwenNLU
 from src.components.evaluator import Evaluator
+from src.utils.background_jobs import JobRegistry
 from src.utils.prompt_template import build_nlu_prompt
 
 # Page Configuration
 st.set_page_config(page_title="NLU Engine Demo", layout="wide", page_icon="🤖")
 
+@st.cache_data
 def load_config():
     try:
         with open("config/config.yaml", "r") as f:
@@ -23,7 +28,79 @@ def load_config():
             "gemini": {"model_name": "gemini-1.5-flash", "temperature": 0.3}
         }
 
+# Resources below survive Streamlit reruns and are shared across sessions
+@st.cache_resource
+def get_schema_registry(intents_path):
+    return SchemaRegistry(intents_path)
+
+@st.cache_resource
+def get_gemma_model(model_name):
+    return GemmaNLU(model_name)
+
+@st.cache_resource
+def get_qwen_model(model_name):
+    return QwenNLU(model_name)
+
+@st.cache_resource
+def get_gemini_model(model_name, api_key, temperature):
+    gemini_config = load_config().get("gemini", {})
+    return GeminiNLU(
+        model_name,
+        api_key,
+        temperature=temperature,
+        requests_per_minute=gemini_config.get("requests_per_minute", 15),
+        max_concurrency=gemini_config.get("max_concurrency", 4),
+        max_retries=gemini_config.get("max_retries", 5)
+    )
+
+@st.cache_resource
+def get_job_registry():
+    return JobRegistry()
+
+class PredictionFailed(Exception):
+    """Raised inside cached_predict so Streamlit does not cache error results."""
+
+    def __init__(self, result):
+        super().__init__(result.get("error"))
+        self.result = result
+
+@st.cache_data(show_spinner=False, max_entries=512, ttl=load_config().get("cache", {}).get("prediction_ttl", 3600))
+def _cached_predict(_model, model_key, schema_version, text, _intents_data):
+    result = _model.predict(text, _intents_data)
+    if isinstance(result, dict) and "error" in result:
+        raise PredictionFailed(result)
+    return result
+
+def cached_predict(model, model_key, schema_version, text, intents_data):
+    """Reuse successful predictions for unchanged (model, schema version, text) inputs."""
+    try:
+        return _cached_predict(model, model_key, schema_version, text, intents_data)
+    except PredictionFailed as e:
+        # Transient failures (quota, connection) are retried on the next call
+        return e.result
+
+def predict_or_raise(model, text, intents_data):
+    """Prediction for background jobs: error results raise, so the job counts them and a rerun retries."""
+    result = model.predict(text, intents_data)
+    if not isinstance(result, dict):
+        raise PredictionFailed({"error": f"unexpected result type {type(result).__name__}"})
+    if "error" in result:
+        raise PredictionFailed(result)
+    return result
+
+def show_job(job):
+    """Render progress and the rows finished so far for a background job."""
+    status = "done" if job.done else "running"
+    st.progress(job.progress, text=f"{job.completed}/{job.total} processed ({status})")
+    rows = job.partial_results()
+    if rows:
+        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+    if job.errors:
+        st.warning(f"{len(job.errors)} predictions failed: {job.errors[0]}")
+
 config = load_config()
+job_registry = get_job_registry()
+running_jobs = []
 
 # Sidebar
 st.sidebar.title("🛠️ Configuration")
@@ -31,7 +108,12 @@ model_type = st.sidebar.selectbox("Select Model", config["llm"]["available_model
 
 if model_type == "gemma":
     model_name = st.sidebar.text_input("Ollama Model Name", value=config["ollama"].get("model_name", "gemma"))
-    model = GemmaNLU(model_name)
+    model = get_gemma_model(model_name)
+    model_key = ("gemma", model_name)
+elif model_type == "qwen":
+    model_name = st.sidebar.text_input("Ollama Model Name", value=config.get("qwen", {}).get("model_name", "qwen2.5:3b"))
+    model = get_qwen_model(model_name)
+    model_key = ("qwen", model_name)
 elif model_type == "gemini":
     model_name = st.sidebar.text_input("Gemini Model Name", value=config["gemini"].get("model_name", "gemini-1.5-flash"))
     api_key = st.sidebar.text_input("Gemini API Key", type="password", value=config["gemini"].get("api_key", ""))
@@ -40,7 +122,10 @@ elif model_type == "gemini":
         st.sidebar.warning("⚠️ Please enter a valid Gemini API Key")
         model = None
     else:
-        model = GeminiNLU(model_name, api_key, temperature=temp)
+        model = get_gemini_model(model_name, api_key, temp)
+    model_key = ("gemini", model_name, temp)
+
+max_workers = st.sidebar.slider("Parallel requests", 1, 16, 4)
 
 st.sidebar.markdown("---")
 show_prompt = st.sidebar.checkbox("Show Raw Prompt", value=False)
@@ -48,7 +133,8 @@ show_prompt = st.sidebar.checkbox("Show Raw Prompt", value=False)
 # Load Intents
 intents_path = "data/raw_data/intents.json"
 try:
-    intents_data = load_intents(intents_path)
+    schema = get_schema_registry(intents_path).current()
+    intents_data = schema.data
 except Exception as e:
     st.error(f"❌ Error loading intents: {e}")
     st.stop()
@@ -83,7 +169,7 @@ with tab1:
                     with st.expander("View Prompt"):
                         st.code(build_nlu_prompt(user_input, intents_data))
                 
-                result = model.predict(user_input, intents_data)
+                result = validate_result(cached_predict(model, model_key, schema.version, user_input, intents_data), schema)
                 
                 if "error" in result:
                     st.error(result["error"])
@@ -112,26 +198,28 @@ with tab2:
     
     num_samples = st.slider("Number of samples to test", 1, len(examples), min(5, len(examples)))
     
+    batch_key = ("batch", model_key, schema.version, selected_intent, num_samples)
+
     if st.button("Run Batch Test"):
         if model is None:
             st.error("Model not configured.")
         else:
-            test_samples = examples[:num_samples]
-            results = []
-            progress_bar = st.progress(0)
-            
-            for idx, text in enumerate(test_samples):
-                res = model.predict(text, intents_data)
-                results.append({
+            def run_batch_sample(text):
+                res = validate_result(predict_or_raise(model, text, intents_data), schema)
+                return {
                     "Text": text,
                     "Predicted Intent": res.get("intent"),
                     "Confidence": res.get("confidence"),
                     "Entities": res.get("entities")
-                })
-                progress_bar.progress((idx + 1) / len(test_samples))
-            
-            df = pd.DataFrame(results)
-            st.dataframe(df, use_container_width=True)
+                }
+
+            job_registry.submit(batch_key, examples[:num_samples], run_batch_sample, max_workers)
+
+    batch_job = job_registry.get(batch_key)
+    if batch_job:
+        show_job(batch_job)
+        if not batch_job.done:
+            running_jobs.append(batch_job)
 
 with tab3:
     st.header("Evaluation Dashboard")
@@ -139,6 +227,8 @@ with tab3:
     
     samples_per_intent = st.number_input("Samples per intent", 1, 10, 2)
     
+    eval_key = ("evaluation", model_key, schema.version, samples_per_intent)
+
     if st.button("Start Full Evaluation"):
         if model is None:
             st.error("Model not configured.")
@@ -148,22 +238,27 @@ with tab3:
                 samples = intent["examples"][:samples_per_intent]
                 for text in samples:
                     all_tests.append({"text": text, "true_intent": intent["name"]})
-            
-            y_true = []
-            y_pred = []
-            
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            for idx, test in enumerate(all_tests):
-                status_text.text(f"Processing {idx+1}/{len(all_tests)}: {test['text'][:50]}...")
-                res = model.predict(test["text"], intents_data)
-                y_true.append(test["true_intent"])
-                y_pred.append(res.get("intent", "unknown"))
-                progress_bar.progress((idx + 1) / len(all_tests))
-            
-            status_text.text("Evaluation Complete!")
-            
+
+            def run_eval_sample(test):
+                res = predict_or_raise(model, test["text"], intents_data)
+                return {
+                    "Text": test["text"],
+                    "True Intent": test["true_intent"],
+                    "Predicted Intent": res.get("intent", "unknown")
+                }
+
+            job_registry.submit(eval_key, all_tests, run_eval_sample, max_workers)
+
+    eval_job = job_registry.get(eval_key)
+    if eval_job:
+        show_job(eval_job)
+        if not eval_job.done:
+            running_jobs.append(eval_job)
+        else:
+            rows = eval_job.partial_results()
+            y_true = [r["True Intent"] for r in rows]
+            y_pred = [r["Predicted Intent"] for r in rows]
+
             try:
                 evaluator = Evaluator()
                 metrics = evaluator.evaluate(y_true, y_pred)
@@ -219,48 +314,61 @@ with tab5:
         2
     )
 
-    if st.button("Run Model Comparison"):
-        with st.spinner("Running inference on both models..."):
-
-            # Initialize BOTH models
-            gemma_model = GemmaNLU(config["ollama"]["model_name"])
-
-            gemini_api_key = config["gemini"].get("api_key")
-            if not gemini_api_key:
-                st.error("Gemini API Key missing in config.yaml")
-                st.stop()
-
-            gemini_model = GeminiNLU(
-                config["gemini"]["model_name"],
-                gemini_api_key,
-                temperature=config["gemini"]["temperature"]
-            )
-
-            selected_intents = intents_data["intents"][:num_intents]
+    compare_key = ("compare", schema.version, num_intents, samples_per_intent)
 
-            y_true, gemma_preds, gemini_preds = [], [], []
-
-            progress = st.progress(0)
-            total = num_intents * samples_per_intent
-            count = 0
-
-            for intent in selected_intents:
-                for text in intent["examples"][:samples_per_intent]:
-                    y_true.append(intent["name"])
-
-                    gemma_preds.append(
-                        gemma_model.predict(text, intents_data).get("intent", "unknown")
-                    )
-                    gemini_preds.append(
-                        gemini_model.predict(text, intents_data).get("intent", "unknown")
-                    )
-
-                    count += 1
-                    progress.progress(count / total)
-
-            evaluator = Evaluator()
-            gemma_metrics = evaluator.evaluate(y_true, gemma_preds)
-            gemini_metrics = evaluator.evaluate(y_true, gemini_preds)
+    if st.button("Run Model Comparison"):
+        # Initialize BOTH models
+        gemma_model = get_gemma_model(config["ollama"]["model_name"])
+
+        gemini_api_key = config["gemini"].get("api_key")
+        if not gemini_api_key:
+            st.error("Gemini API Key missing in config.yaml")
+            st.stop()
+
+        gemini_model = get_gemini_model(
+            config["gemini"]["model_name"],
+            gemini_api_key,
+            config["gemini"]["temperature"]
+        )
+
+        comparison_tests = []
+        for intent in intents_data["intents"][:num_intents]:
+            for text in intent["examples"][:samples_per_intent]:
+                comparison_tests.append({"text": text, "true_intent": intent["name"]})
+
+        def comparison_worker(nlu_model):
+            def run_sample(test):
+                return {
+                    "Text": test["text"],
+                    "True Intent": test["true_intent"],
+                    "Predicted Intent": predict_or_raise(nlu_model, test["text"], intents_data).get("intent", "unknown")
+                }
+            return run_sample
+
+        # Both models run concurrently on the same samples
+        job_registry.submit(compare_key + ("gemma",), comparison_tests, comparison_worker(gemma_model), max_workers)
+        job_registry.submit(compare_key + ("gemini",), comparison_tests, comparison_worker(gemini_model), max_workers)
+
+    gemma_job = job_registry.get(compare_key + ("gemma",))
+    gemini_job = job_registry.get(compare_key + ("gemini",))
+
+    if gemma_job and gemini_job:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**Gemma**")
+            show_job(gemma_job)
+        with col2:
+            st.write("**Gemini**")
+            show_job(gemini_job)
+        running_jobs.extend(job for job in (gemma_job, gemini_job) if not job.done)
+
+    if gemma_job and gemini_job and gemma_job.done and gemini_job.done:
+        gemma_rows = gemma_job.partial_results()
+        gemini_rows = gemini_job.partial_results()
+
+        evaluator = Evaluator()
+        gemma_metrics = evaluator.evaluate([r["True Intent"] for r in gemma_rows], [r["Predicted Intent"] for r in gemma_rows])
+        gemini_metrics = evaluator.evaluate([r["True Intent"] for r in gemini_rows], [r["Predicted Intent"] for r in gemini_rows])
 
         # -------- METRICS --------
         st.subheader("📊 Overall Metrics")
@@ -315,3 +423,8 @@ with tab5:
         ax.legend()
 
         st.pyplot(fig)
+
+# Poll while background jobs are running so their tables update live
+if running_jobs:
+    time.sleep(1.0)
+    st.rerun()
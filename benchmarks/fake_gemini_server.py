@@ -0,0 +1,152 @@
+"""
+Fake Gemini Endpoint
+--------------------
+A local stand-in for the Gemini REST API that enforces a requests-per-
+minute quota and answers 429 RESOURCE_EXHAUSTED above it, so the
+GeminiNLU rate limiter can be exercised without a real key or quota.
+
+Usage:
+    # Serve only
+    python -m benchmarks.fake_gemini_server --port 8765 --rpm 60
+
+    # Serve and run GeminiNLU.predict_many against it
+    python -m benchmarks.fake_gemini_server --demo --rpm 120 --client-rpm 100 --requests 40
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.components.json_loader import load_intents
+
+_QUERY_RE = re.compile(r'User Input: "(.*)"\s*$', re.DOTALL)
+
+
+class FakeGeminiState:
+    def __init__(self, rpm: int, latency: float, intents_path: str):
+        self.rpm = rpm
+        self.latency = latency
+        self.window = deque()
+        self.lock = threading.Lock()
+        self.served = 0
+        self.rejected = 0
+        data = load_intents(intents_path)
+        self.example_to_intent = {
+            example.lower(): intent["name"] for intent in data["intents"] for example in intent["examples"]
+        }
+
+    def admit(self) -> bool:
+        """Sliding one-minute window quota."""
+        now = time.monotonic()
+        with self.lock:
+            while self.window and now - self.window[0] > 60:
+                self.window.popleft()
+            if len(self.window) >= self.rpm:
+                self.rejected += 1
+                return False
+            self.window.append(now)
+            self.served += 1
+            return True
+
+
+def make_handler(state: FakeGeminiState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, payload: dict):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+
+            if ":generateContent" not in self.path:
+                self._send(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+                return
+            if not state.admit():
+                self._send(429, {"error": {"code": 429, "message": "Resource has been exhausted (e.g. check quota).", "status": "RESOURCE_EXHAUSTED"}})
+                return
+
+            time.sleep(state.latency)
+            prompt = request["contents"][0]["parts"][0]["text"]
+            match = _QUERY_RE.search(prompt)
+            query = match.group(1) if match else ""
+            intent = state.example_to_intent.get(query.lower(), "general_conversation")
+            answer = {"intent": intent, "confidence": 0.9, "entities": {}, "response": f"(fake) {query}"}
+
+            self._send(200, {
+                "candidates": [{
+                    "content": {"parts": [{"text": json.dumps(answer)}], "role": "model"},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }],
+                "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": 30},
+            })
+
+    return Handler
+
+
+def serve(port: int, rpm: int, latency: float, intents_path: str):
+    state = FakeGeminiState(rpm, latency, intents_path)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Gemini endpoint with a request quota")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rpm", type=int, default=60, help="Server-side quota (requests per minute)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per successful request")
+    parser.add_argument("--intents", default="data/raw_data/intents.json")
+    parser.add_argument("--demo", action="store_true", help="Run GeminiNLU.predict_many against the fake server")
+    parser.add_argument("--client-rpm", type=float, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=30)
+    args = parser.parse_args()
+
+    server, state = serve(args.port, args.rpm, args.latency, args.intents)
+    print(f"Fake Gemini endpoint on http://127.0.0.1:{args.port} (quota {args.rpm} rpm)")
+
+    if not args.demo:
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    from src.components.gemini_nlu import GeminiNLU
+
+    intents_data = load_intents(args.intents)
+    texts = [example for intent in intents_data["intents"] for example in intent["examples"]][:args.requests]
+    model = GeminiNLU(
+        "gemini-1.5-flash",
+        "fake-key",
+        requests_per_minute=args.client_rpm,
+        max_concurrency=args.concurrency,
+        endpoint=f"http://127.0.0.1:{args.port}",
+    )
+
+    start = time.perf_counter()
+    results = model.predict_many(texts, intents_data)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for r in results if "error" in r)
+
+    print(f"{len(texts)} requests in {elapsed:.1f}s ({len(texts) / elapsed * 60:.0f}/min), "
+          f"{failed} failed, {state.rejected} answered 429 by the server")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
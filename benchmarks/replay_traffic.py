@@ -0,0 +1,282 @@
+"""
+Traffic Replay
+--------------
+Replays production queries from logs/history.jsonl against a running
+server, so scaling changes are tested with real message lengths, intent
+mix and arrival pattern rather than one synthetic message.
+
+Requests are sent at the original inter-arrival times divided by
+--speedup (0 sends as fast as the concurrency ceiling allows). Each
+replayed query goes to /analyze by default; --mix spreads the traffic
+over several endpoints by weight, e.g. "analyze=8,history=1,intents=1".
+
+Latency is measured per request. Non-200 responses count as errors, and
+so do 200 responses from POST endpoints whose body carries an "error"
+field (status "error_body"), since /analyze reports backend failures
+that way. "Lag" is how far behind schedule a request was sent, which
+grows when the concurrency ceiling or the server cannot keep up with the
+replayed rate.
+
+Repeated messages are normally answered from the server's prediction
+cache; the report gives the /analyze cache hit ratio, and --no-cache
+makes every replayed query skip the cache lookup to measure the backend.
+
+Usage:
+    python -m benchmarks.replay_traffic --url http://127.0.0.1:8000 --speedup 10 --concurrency 32
+    python -m benchmarks.replay_traffic --speedup 0 --limit 2000 --mix analyze=9,history=1
+    python -m benchmarks.replay_traffic --speedup 0 --no-cache
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from src.components.evaluator import percentile
+from src.utils.logger import LOG_FILE
+
+# Endpoint name -> (method, path); POST endpoints send the replayed message
+ENDPOINTS = {
+    "analyze": ("POST", "/analyze"),
+    "history": ("GET", "/history?limit=50"),
+    "intents": ("GET", "/intents"),
+    "config": ("GET", "/config"),
+    "ready": ("GET", "/ready"),
+}
+
+
+def load_events(log_path: Path, limit: Optional[int] = None, model_type: Optional[str] = None) -> List[Dict]:
+    """
+    Read replayable queries as {"offset", "message", "model_type", "model_name"},
+    with offsets in seconds from the first query.
+    """
+    events = []
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                timestamp = datetime.fromisoformat(entry["timestamp"]).timestamp()
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                continue
+            message = entry.get("message") or entry.get("input")
+            if not message:
+                continue
+            entry_type = entry.get("model_type") or "gemma"
+            model_name = entry.get("model")
+            events.append({
+                "timestamp": timestamp,
+                "message": message,
+                "model_type": model_type or entry_type,
+                # The log stores the type as the model when no explicit name was used
+                "model_name": None if model_type or model_name == entry_type else model_name,
+            })
+
+    events.sort(key=lambda e: e["timestamp"])
+    if limit:
+        events = events[:limit]
+    if events:
+        start = events[0]["timestamp"]
+        for event in events:
+            event["offset"] = event.pop("timestamp") - start
+    return events
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}'; choose from {list(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class ReplayClient:
+    """
+    Sends requests over one keep-alive connection per thread.
+    """
+
+    def __init__(self, url: str, timeout: float, no_cache: bool = False):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self.no_cache = no_cache
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def send(self, endpoint: str, event: Dict) -> Dict:
+        method, path = ENDPOINTS[endpoint]
+        body, headers = None, {}
+        if method == "POST":
+            payload = {"message": event["message"], "model_type": event["model_type"]}
+            if event["model_name"]:
+                payload["model_name"] = event["model_name"]
+            if self.no_cache:
+                payload["no_cache"] = True
+            body = json.dumps(payload)
+            headers["Content-Type"] = "application/json"
+
+        start = time.perf_counter()
+        try:
+            conn = self._connection()
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException) as e:
+            # Drop the broken connection; the next request on this thread reconnects
+            self._local.conn = None
+            status = type(e).__name__
+            data = b""
+        latency = time.perf_counter() - start
+
+        # /analyze reports backend failures as 200 with an "error" field
+        cached = None
+        if status == 200 and method == "POST":
+            try:
+                payload = json.loads(data)
+            except ValueError:
+                status = "invalid_json"
+            else:
+                if isinstance(payload, dict) and payload.get("error"):
+                    status = "error_body"
+                elif isinstance(payload, dict):
+                    cached = payload.get("cached")
+        return {"endpoint": endpoint, "status": status, "latency": latency, "cached": cached}
+
+
+def summarize(records: List[Dict], elapsed: float) -> Dict:
+    def stats(group: List[Dict]) -> Dict:
+        latencies = [r["latency"] for r in group]
+        lags = [r["lag"] for r in group]
+        errors = sum(1 for r in group if r["status"] != 200)
+        statuses: Dict[str, int] = {}
+        for r in group:
+            statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+        # Only successful responses that report it (POST /analyze) count toward the hit ratio
+        flagged = [r["cached"] for r in group if r.get("cached") is not None]
+        return {
+            "requests": len(group),
+            "errors": errors,
+            "error_rate": errors / len(group) if group else 0.0,
+            "statuses": statuses,
+            "cache_hits": sum(1 for c in flagged if c),
+            "cache_hit_ratio": sum(1 for c in flagged if c) / len(flagged) if flagged else None,
+            "latency_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "latency_p99": percentile(latencies, 99),
+            "latency_max": max(latencies) if latencies else 0.0,
+            "lag_p95": percentile(lags, 95),
+        }
+
+    by_endpoint: Dict[str, List[Dict]] = {}
+    for record in records:
+        by_endpoint.setdefault(record["endpoint"], []).append(record)
+
+    results = stats(records)
+    results["seconds"] = elapsed
+    results["rps"] = len(records) / elapsed if elapsed else 0.0
+    results["per_endpoint"] = {name: stats(group) for name, group in sorted(by_endpoint.items())}
+    return results
+
+
+def replay(
+    events: List[Dict],
+    url: str,
+    speedup: float = 1.0,
+    concurrency: int = 16,
+    mix: Optional[Dict[str, float]] = None,
+    seed: int = 0,
+    timeout: float = 120.0,
+    no_cache: bool = False,
+) -> Dict:
+    mix = mix or {"analyze": 1.0}
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    client = ReplayClient(url, timeout, no_cache)
+    records: List[Dict] = []
+    records_lock = threading.Lock()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # Bound the backlog so a slow server shows up as lag, not unbounded queued work
+        slots = threading.BoundedSemaphore(concurrency * 2)
+
+        def run_one(endpoint: str, event: Dict, scheduled: float):
+            try:
+                lag = max(0.0, time.perf_counter() - start - scheduled)
+                record = client.send(endpoint, event)
+                record["lag"] = lag
+                with records_lock:
+                    records.append(record)
+            finally:
+                slots.release()
+
+        for event in events:
+            scheduled = event["offset"] / speedup if speedup > 0 else 0.0
+            delay = scheduled - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+            slots.acquire()
+            pool.submit(run_one, rng.choices(names, weights)[0], event, scheduled)
+    elapsed = time.perf_counter() - start
+
+    return summarize(records, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay logs/history.jsonl against a running server")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--log", default=str(LOG_FILE))
+    parser.add_argument("--speedup", type=float, default=1.0, help="Divide inter-arrival times by this; 0 = no pacing")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum requests in flight")
+    parser.add_argument("--mix", default="analyze=1", help="Endpoint weights, e.g. analyze=8,history=1,intents=1")
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N queries")
+    parser.add_argument("--model-type", default=None, help="Send every query to this backend instead of the logged one")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the endpoint mix")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--no-cache", action="store_true", help="Ask /analyze to skip its prediction cache lookup")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    events = load_events(Path(args.log), args.limit, args.model_type)
+    if not events:
+        raise SystemExit(f"No replayable queries in {args.log}")
+    span = events[-1]["offset"]
+    pace = f"{args.speedup}x" if args.speedup > 0 else "unpaced"
+    print(f"Replaying {len(events)} queries spanning {span:.0f}s ({pace}) against {args.url}, concurrency {args.concurrency}")
+
+    report = replay(events, args.url, args.speedup, args.concurrency, parse_mix(args.mix), args.seed, args.timeout, args.no_cache)
+
+    print(f"\n{report['requests']} requests in {report['seconds']:.1f}s ({report['rps']:.1f} req/s), "
+          f"error rate {report['error_rate']:.2%}, schedule lag p95 {report['lag_p95']:.3f}s")
+    if report["cache_hit_ratio"] is not None:
+        print(f"Prediction cache hit ratio {report['cache_hit_ratio']:.2%} ({report['cache_hits']} hits)")
+    print(f"{'endpoint':>10}{'requests':>10}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name, stats in report["per_endpoint"].items():
+        print(f"{name:>10}{stats['requests']:>10}{stats['errors']:>8}{stats['latency_p50']:>9.3f}"
+              f"{stats['latency_p95']:>9.3f}{stats['latency_p99']:>9.3f}{stats['latency_max']:>9.3f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print("Report saved to", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Worker Scaling Benchmark
+------------------------
+Starts the API with an increasing number of uvicorn workers and measures
+request throughput for one endpoint, to check that throughput scales
+with CPU cores when state lives in the shared store.
+
+Usage:
+    python -m benchmarks.worker_scaling --workers 1,2,4 --requests 4000
+    python -m benchmarks.worker_scaling --endpoint /analyze --workers 1,2,4
+
+For /analyze the prediction cache is seeded first, so the benchmark
+measures the serving path rather than LLM latency.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+BENCH_MESSAGE = "Book a flight to Delhi tomorrow"
+
+
+def _wait_ready(port: int, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/ready")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not become ready")
+
+
+def _client(port: int, endpoint: str, count: int) -> int:
+    """Send `count` requests over one keep-alive connection; return the error count."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    body = json.dumps({"message": BENCH_MESSAGE, "model_type": "gemma"})
+    errors = 0
+    for _ in range(count):
+        if endpoint == "/analyze":
+            conn.request("POST", endpoint, body=body, headers={"Content-Type": "application/json"})
+        else:
+            conn.request("GET", endpoint)
+        response = conn.getresponse()
+        response.read()
+        if response.status != 200:
+            errors += 1
+    return errors
+
+
+def _seed_prediction_cache():
+    """Store a canned prediction for the benchmark message, keyed exactly as /analyze does."""
+    import server
+
+    model, model_name = server.get_model_instance("gemma")
+    message, _ = server.prepare_long_input(BENCH_MESSAGE, model)
+    key = server.prediction_cache_key(model_name, 0.3, server.get_schema_registry().version, message, model.cache_version)
+    server.get_shared_store().set(
+        "predictions",
+        key,
+        {"intent": "book_flight", "confidence": 0.9, "entities": {"location": "Delhi", "date": "tomorrow"}, "response": "Sure."},
+    )
+
+
+def run(workers: int, endpoint: str, total_requests: int, concurrency: int, port: int) -> dict:
+    env = dict(os.environ, NLU_LAZY_STARTUP="1")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        _wait_ready(port)
+        per_client = total_requests // concurrency
+        with ProcessPoolExecutor(max_workers=concurrency) as pool:
+            # Warm-up round so every worker has initialized
+            list(pool.map(_client, [port] * concurrency, [endpoint] * concurrency, [5] * concurrency))
+            start = time.perf_counter()
+            errors = sum(pool.map(_client, [port] * concurrency, [endpoint] * concurrency, [per_client] * concurrency))
+            elapsed = time.perf_counter() - start
+        sent = per_client * concurrency
+        return {"workers": workers, "requests": sent, "errors": errors, "seconds": elapsed, "rps": sent / elapsed}
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure throughput scaling with uvicorn worker count")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--endpoint", default="/intents", choices=["/intents", "/config", "/analyze"])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    if args.endpoint == "/analyze":
+        _seed_prediction_cache()
+
+    print(f"CPU cores: {os.cpu_count()}  endpoint: {args.endpoint}  concurrency: {args.concurrency}")
+    print(f"{'workers':>8}{'req/s':>12}{'speedup':>10}{'efficiency':>12}{'errors':>8}")
+
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        result = run(workers, args.endpoint, args.requests, args.concurrency, args.port)
+        baseline = baseline or result["rps"]
+        speedup = result["rps"] / baseline
+        print(f"{workers:>8}{result['rps']:>12.1f}{speedup:>10.2f}{speedup / workers:>12.0%}{result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
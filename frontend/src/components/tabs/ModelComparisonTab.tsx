@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { motion } from 'framer-motion';
-import { GitCompare, Play, Loader2, Trophy, Target, Crosshair, RotateCcw } from 'lucide-react';
+import { GitCompare, Play, Loader2, Trophy, Target, Crosshair, RotateCcw, Timer } from 'lucide-react';
 import { compareModels, CompareModelsResponse, ModelMetrics } from '@/lib/api';
 
 const ModelComparisonTab: React.FC = () => {
@@ -49,6 +49,13 @@ const ModelComparisonTab: React.FC = () => {
     </div>
   );
 
+  const CostStat = ({ label, value }: { label: string; value: string }) => (
+    <div className="flex items-center justify-between">
+      <span className="text-muted-foreground">{label}</span>
+      <span className="font-mono font-medium text-foreground">{value}</span>
+    </div>
+  );
+
   const ModelCard = ({ name, metrics, winner }: { name: string; metrics: ModelMetrics; winner: boolean }) => (
     <motion.div
       initial={{ opacity: 0, y: 20 }}
@@ -87,6 +94,24 @@ const ModelComparisonTab: React.FC = () => {
         <MetricBar value={metrics.f1} label="F1 Score" icon={RotateCcw} color="text-warning" />
       </div>
 
+      {/* Cost */}
+      {metrics.performance && metrics.performance.samples > 0 && (
+        <div className="mt-6 pt-4 border-t border-border/30">
+          <div className="flex items-center gap-2 mb-3">
+            <Timer className="w-4 h-4 text-muted-foreground" />
+            <span className="text-xs text-muted-foreground uppercase tracking-wider">Cost</span>
+          </div>
+          <div className="grid grid-cols-2 gap-3 text-sm">
+            <CostStat label="Latency p50" value={`${metrics.performance.latency_p50.toFixed(2)} s`} />
+            <CostStat label="Latency p95" value={`${metrics.performance.latency_p95.toFixed(2)} s`} />
+            <CostStat label="Tokens / query" value={(metrics.performance.prompt_tokens_mean + metrics.performance.output_tokens_mean).toFixed(0)} />
+            <CostStat label="Output tokens / s" value={metrics.performance.tokens_per_sec.toFixed(1)} />
+            <CostStat label="Parse fallbacks" value={`${(metrics.performance.fallback_rate * 100).toFixed(1)}%`} />
+            <CostStat label="Accuracy / s (p50)" value={metrics.performance.latency_p50 > 0 ? (metrics.accuracy / metrics.performance.latency_p50).toFixed(2) : '-'} />
+          </div>
+        </div>
+      )}
+
       {/* Overall Score */}
       <div className="mt-6 pt-4 border-t border-border/30 text-center">
         <span className="text-xs text-muted-foreground uppercase tracking-wider">Overall Score</span>
@@ -27,16 +27,24 @@ export interface ConfigResponse {
 
 export interface AnalyzeRequest {
   message: string;
-  model_type: 'gemma' | 'qwen';
+  model_type: 'gemma' | 'qwen' | 'distilled';
   model_name?: string;
   api_key?: string;
   temperature?: number;
+  // Skip the prediction cache lookup (benchmarks, debugging)
+  no_cache?: boolean;
 }
 
 export interface AnalyzeResponse {
   intent: string;
   confidence: number;
   entities: Record<string, string>;
+  // Entities dropped by schema validation, when any
+  entity_issues?: string[];
+  // Backend that produced the answer for the distilled model ("distilled" or its LLM fallback)
+  answered_by?: string;
+  // True when the prediction came from the shared cache
+  cached?: boolean;
 }
 
 export interface BatchTestRequest {
@@ -49,10 +57,14 @@ export interface BatchTestResult {
   predicted_intent: string;
   confidence: number;
   entities: Record<string, string>;
+  entity_issues?: string[];
 }
 
 export interface EvaluateRequest {
   samples_per_intent: number;
+  dataset_path?: string;
+  seed?: number;
+  run_id?: string;
 }
 
 export interface EvaluateResponse {
@@ -63,6 +75,12 @@ export interface EvaluateResponse {
     f1: number;
     support: number;
   }>;
+  run_id?: string;
+  seed?: number;
+  completed?: number;
+  total?: number;
+  failed?: number;
+  performance?: PerformanceSummary;
 }
 
 export interface CompareModelsRequest {
@@ -70,11 +88,29 @@ export interface CompareModelsRequest {
   samples_per_intent: number;
 }
 
+export interface PerformanceStats {
+  samples: number;
+  latency_mean: number;
+  latency_p50: number;
+  latency_p95: number;
+  latency_p99: number;
+  prompt_tokens_mean: number;
+  output_tokens_mean: number;
+  tokens_per_sec: number;
+  fallback_rate: number;
+}
+
+export interface PerformanceSummary extends PerformanceStats {
+  parse_outcomes: Record<string, number>;
+  per_intent: Record<string, PerformanceStats>;
+}
+
 export interface ModelMetrics {
   accuracy: number;
   precision: number;
   recall: number;
   f1: number;
+  performance?: PerformanceSummary;
 }
 
 export interface CompareModelsResponse {
@@ -107,6 +143,42 @@ export const compareModels = async (request: CompareModelsRequest): Promise<Comp
   return response.data;
 };
 
+export interface ChatSession {
+  session_id: string;
+  model_type: string;
+  model: string;
+  turns: number;
+  context_tokens: number;
+}
+
+export interface ChatTurnResponse extends AnalyzeResponse {
+  response: string;
+  session_id: string;
+  stats: {
+    turn: number;
+    latency: number;
+    prompt_eval_tokens: number;
+    output_tokens: number;
+    context_tokens: number;
+    context_restarted: boolean;
+  };
+}
+
+export const createChatSession = async (model_type: 'gemma' | 'qwen', model_name?: string): Promise<ChatSession> => {
+  const response = await api.post<ChatSession>('/chat/sessions', { model_type, model_name });
+  return response.data;
+};
+
+export const sendChatMessage = async (sessionId: string, message: string): Promise<ChatTurnResponse> => {
+  const response = await api.post<ChatTurnResponse>(`/chat/${sessionId}`, { message });
+  return response.data;
+};
+
+export const chatSocketUrl = (params: { session_id?: string; model_type?: string } = {}): string => {
+  const query = new URLSearchParams(params as Record<string, string>).toString();
+  return `${API_BASE.replace(/^http/, 'ws')}/ws/chat${query ? `?${query}` : ''}`;
+};
+
 // Add this to api.ts
 
 export interface HistoryItem {
@@ -1,18 +1,35 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
-import yaml
+from functools import lru_cache
 import os
-from dotenv import load_dotenv
 import random
-
-load_dotenv()
-from src.components.json_loader import load_intents
-from src.components.gemma_nlu import GemmaNLU
-from src.components.qwen_nlu import QwenNLU
+import hashlib
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Heavy dependencies (yaml, dotenv, sklearn) are imported on first use so the
+# process can answer liveness probes immediately after start.
+from src.components.schema_registry import SchemaRegistry
+from src.components.chat_sessions import ChatSessionManager, run_turn
+from src.components.dataset import stratified_sample
+from src.components.eval_runs import EvaluationRun, select_samples
+from src.components.entity_validator import validate_result
+from src.components.model_factory import create_model
 from src.components.evaluator import Evaluator
 from src.utils.logger import log_query, read_logs, LOG_FILE
+from src.utils.shared_store import SharedStore, prediction_cache_key
+from src.utils.long_input import compress_long_input
+from src.utils.prompt_template import build_nlu_prompt, build_summary_prompt
+from src.utils.token_counter import count_tokens
+from src.utils.config import load_config
 
 app = FastAPI(title="NLU Engine API")
 # Trigger reload
@@ -24,33 +41,101 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Compress responses above a size threshold (bytes); small payloads are cheaper uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("NLU_GZIP_MIN_SIZE", "1024")))
+
+# Startup mode: "eager" warms everything in the background after start,
+# "lazy" defers heavy modules until the request that needs them.
+startup_state = {
+    "mode": "lazy" if os.getenv("NLU_LAZY_STARTUP", "0") == "1" else "eager",
+    "started_at": time.time(),
+    "ready": False,
+    "ready_seconds": None,
+    "error": None,
+}
+
 # Load Config & Data
-def load_config():
-    try:
-        with open("config/config.yaml", "r") as f:
-            return yaml.safe_load(f)
-    except FileNotFoundError:
-        return {}
+@lru_cache(maxsize=None)
+def get_app_config():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return load_config()
 
-config = load_config()
 intents_path = "data/raw_data/intents.json"
-intents_data = load_intents(intents_path)
+DATASET_ROOT = Path("data").resolve()
+
+@lru_cache(maxsize=None)
+def get_schema_registry():
+    poll_interval = get_app_config().get("schema", {}).get("poll_interval", 2.0)
+    return SchemaRegistry(intents_path, poll_interval=poll_interval)
+
+@lru_cache(maxsize=None)
+def get_shared_store():
+    """SQLite store shared by all worker processes on this host."""
+    return SharedStore(get_app_config().get("server", {}).get("shared_store_path", "logs/shared_state.db"))
+
+@lru_cache(maxsize=None)
+def get_chat_sessions():
+    """Chat sessions live in this worker's memory; route a session's requests to one worker."""
+    settings = get_app_config().get("chat", {})
+    return ChatSessionManager(
+        max_sessions=settings.get("max_sessions", 1000),
+        idle_ttl=settings.get("idle_ttl", 900),
+        max_total_tokens=settings.get("max_total_context_tokens", 2_000_000),
+    )
+
+# Identifies this worker process when taking leases in the shared store
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+def initialize():
+    """Load config and schema, then warm heavy modules unless running lazily."""
+    try:
+        get_app_config()
+        get_schema_registry()
+        get_shared_store().purge_expired()
+        if startup_state["mode"] == "eager":
+            Evaluator.warm_up()
+        startup_state["ready"] = True
+        startup_state["ready_seconds"] = round(time.time() - startup_state["started_at"], 3)
+    except Exception as e:
+        startup_state["error"] = str(e)
+
+def purge_expired_loop():
+    """Drop expired cache entries and leases so the shared store does not grow without bound."""
+    interval = get_app_config().get("cache", {}).get("purge_interval", 600)
+    while True:
+        time.sleep(interval)
+        try:
+            get_shared_store().purge_expired()
+        except Exception as e:
+            print(f"Shared store purge failed: {e}")
+
+@app.on_event("startup")
+def start_background_init():
+    threading.Thread(target=initialize, name="nlu-init", daemon=True).start()
+    threading.Thread(target=purge_expired_loop, name="nlu-purge", daemon=True).start()
 
 class AnalysisRequest(BaseModel):
     message: str
-    model_type: str  # "gemma" or "qwen"
+    model_type: str  # "gemma", "qwen" or "distilled"
     model_name: Optional[str] = None
     api_key: Optional[str] = None
     temperature: Optional[float] = 0.3
+    no_cache: bool = False  # Skip the cache lookup; the fresh result is still stored
 
 class EvaluateRequest(BaseModel):
     samples_per_intent: int = 5
+    dataset_path: Optional[str] = None  # CSV/JSONL/Parquet under data/; defaults to intents.json examples
     model_type: Optional[str] = None
     model_name: Optional[str] = None
     api_key: Optional[str] = None
     temperature: Optional[float] = 0.3
+    seed: Optional[int] = None  # random when omitted; returned so the run can be reproduced
+    run_id: Optional[str] = None  # resume this run if it exists, otherwise create it under this id
 
 class BatchTestRequest(BaseModel):
     intent: str
@@ -60,30 +145,23 @@ class BatchTestRequest(BaseModel):
     api_key: Optional[str] = None
     temperature: Optional[float] = 0.3
 
+class ChatSessionRequest(BaseModel):
+    model_type: Optional[str] = None  # "gemma" or "qwen"
+    model_name: Optional[str] = None
+
+class ChatMessageRequest(BaseModel):
+    message: str
+
 class CompareRequest(BaseModel):
     num_intents: Optional[int] = None
     samples_per_intent: int = 5
     
 def get_model_instance(model_type, model_name=None, api_key=None, temperature=0.3):
     """Helper to initialize model instance."""
-    actual_model_name = None
-    model = None
-
-    # Default to gemma if not specified
-    if not model_type:
-        model_type = config.get("llm", {}).get("default_model", "gemma")
-
-    if model_type == "gemma":
-        actual_model_name = model_name or config.get("ollama", {}).get("model_name", "gemma")
-        model = GemmaNLU(actual_model_name)
-    elif model_type == "qwen":
-        actual_model_name = model_name or config.get("qwen", {}).get("model_name", "qwen2.5:3b")
-        # Qwen via Ollama doesn't need API key
-        model = QwenNLU(actual_model_name)
-    else:
-        raise HTTPException(status_code=400, detail="Unknown model type")
-    
-    return model, actual_model_name
+    try:
+        return create_model(model_type, get_app_config(), model_name, api_key, temperature)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 def transform_classification_report(report):
     """Transform sklearn report to match frontend expectations"""
@@ -98,18 +176,109 @@ def transform_classification_report(report):
             }
     return transformed
 
+def resolve_dataset_path(dataset_path):
+    """Resolve a dataset path, refusing files outside the data/ directory."""
+    path = Path(dataset_path)
+    if not path.is_absolute():
+        path = Path.cwd() / path
+    path = path.resolve()
+    if DATASET_ROOT not in path.parents:
+        raise HTTPException(status_code=400, detail="dataset_path must point inside the data/ directory")
+    if not path.exists():
+        raise HTTPException(status_code=404, detail=f"Dataset '{dataset_path}' not found")
+    return str(path)
+
+def postprocess_entities(result, schema=None):
+    """Validate and normalize a result's entities against the current schema, in place."""
+    return validate_result(result, schema or get_schema_registry().current())
+
+def prepare_long_input(message, model=None):
+    """Fit a message into the configured prompt token budget."""
+    settings = get_app_config().get("long_input", {})
+    # Cached per schema version, rebuilt automatically after intents.json changes
+    prompt_overhead = get_schema_registry().current().derive(
+        "prompt_overhead_tokens", lambda schema: count_tokens(build_nlu_prompt("", schema.data))
+    )
+    budget = max(settings.get("max_prompt_tokens", 2048) - prompt_overhead, 64)
+
+    summarizer = None
+    if settings.get("summarize_with_model", False) and hasattr(model, "generate"):
+        summarizer = lambda chunk: model.generate(build_summary_prompt(chunk))
+
+    return compress_long_input(
+        message,
+        budget,
+        keep_recent_turns=settings.get("keep_recent_turns", 6),
+        summary_tokens_per_turn=settings.get("summary_tokens_per_turn", 40),
+        chunk_tokens=settings.get("chunk_tokens", 400),
+        summarizer=summarizer,
+        max_workers=settings.get("max_workers", 4),
+    )
+
+@app.get("/health")
+def health():
+    """Liveness probe: the process is up and serving HTTP."""
+    return {"status": "ok"}
+
+@app.get("/ready")
+def ready():
+    """Readiness probe: config and schema are loaded (and warmed in eager mode)."""
+    status_code = 200 if startup_state["ready"] else 503
+    return JSONResponse(status_code=status_code, content=startup_state)
+
+@lru_cache(maxsize=None)
+def get_config_version():
+    raw = json.dumps(get_app_config(), sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+def cached_json_response(request: Request, etag: str, build_payload):
+    """Answer 304 when the client already holds this version, otherwise send the payload with its ETag."""
+    etag = f'"{etag}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=build_payload(), headers=headers)
+
 @app.get("/config")
-def get_config():
-    return config
+def get_config(request: Request):
+    return cached_json_response(request, f"config-{get_config_version()}", get_app_config)
 
 @app.get("/intents")
-def get_intents():
-    return intents_data
+def get_intents(request: Request):
+    schema = get_schema_registry().current()
+    return cached_json_response(request, f"schema-{schema.version}", lambda: schema.data)
+
+HISTORY_FIELDS = ("timestamp", "input", "model", "intent", "confidence")
 
 @app.get("/history")
-def get_history(limit: int = 200):
-    """Return recent history entries (newest first)."""
-    return read_logs(limit)
+def get_history(request: Request, limit: int = 200, fields: Optional[str] = None, compact: bool = False):
+    """Return recent history entries (newest first).
+
+    `fields` selects a comma-separated subset of columns; `compact=true` returns
+    {"fields": [...], "rows": [[...], ...]} instead of one object per entry.
+    """
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(HISTORY_FIELDS)
+    unknown = [f for f in selected if f not in HISTORY_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown history fields: {unknown}")
+
+    try:
+        stat = LOG_FILE.stat()
+        log_version = f"{stat.st_mtime_ns}-{stat.st_size}"
+    except FileNotFoundError:
+        log_version = "empty"
+    etag = hashlib.sha256(f"{log_version}|{limit}|{','.join(selected)}|{compact}".encode("utf-8")).hexdigest()[:16]
+
+    def build_payload():
+        items = read_logs(limit)
+        if compact:
+            return {"fields": selected, "rows": [[item.get(f) for f in selected] for item in items]}
+        if fields:
+            return [{f: item.get(f) for f in selected} for item in items]
+        return items
+
+    return cached_json_response(request, f"history-{etag}", build_payload)
 
 @app.delete("/history")
 def clear_history():
@@ -126,16 +295,24 @@ def analyze_query(req: AnalysisRequest):
         # Measure word count
         word_count = len(req.message.split())
         
-        # Safely handle long inputs: truncate if exceeded
-        processed_message = req.message
-        if len(processed_message) > 4000:
-            # Keep start (for context) and end (for the latest query)
-            processed_message = processed_message[:500] + "\n... [truncated] ...\n" + processed_message[-3500:]
-
         model, model_name = get_model_instance(req.model_type, req.model_name, req.api_key, req.temperature)
-            
-        # Run prediction
-        result = model.predict(processed_message, intents_data)
+        schema = get_schema_registry().current()
+
+        # Safely handle long inputs: compress older turns to fit the prompt token budget
+        processed_message, _ = prepare_long_input(req.message, model)
+
+        # Run prediction, reusing results cached by any worker
+        store = get_shared_store()
+        cache_key = prediction_cache_key(model_name, req.temperature, schema.version, processed_message, model.cache_version)
+        result = None if req.no_cache else store.get("predictions", cache_key)
+        cached = result is not None
+        if not cached:
+            result = model.predict(processed_message, schema.data)
+            # Validate before caching, so every cache hit is already checked
+            postprocess_entities(result, schema)
+            if isinstance(result, dict) and "error" not in result:
+                ttl = get_app_config().get("cache", {}).get("prediction_ttl", 3600)
+                store.set("predictions", cache_key, result, ttl=ttl)
         
         # Ensure a valid response is always returned
         if not result or not isinstance(result, dict):
@@ -152,6 +329,7 @@ def analyze_query(req: AnalysisRequest):
         if "error" in result:
              if not result.get("response") or result.get("response").startswith("I'm here to help"):
                 result["response"] = f"I encountered an issue: {result['error']}. However, I'm still here to help with other queries!"
+        result["cached"] = cached
         
         # Persist query to history (best-effort)
         try:
@@ -169,64 +347,203 @@ def analyze_query(req: AnalysisRequest):
             "error": str(e)
         }
 
-@app.post("/evaluate")
-def evaluate_model(req: EvaluateRequest):
+def chat_turn(session, message):
+    """Run one chat turn and record it in history."""
+    model, _ = get_model_instance(session.model_type, session.model_name)
+    settings = get_app_config().get("chat", {})
+    result, stats = run_turn(
+        session,
+        model,
+        message,
+        get_schema_registry().current(),
+        max_session_tokens=settings.get("max_session_tokens", 8192),
+    )
+    postprocess_entities(result)
+
+    # Persist query to history (best-effort)
     try:
-        model, _ = get_model_instance(req.model_type, req.model_name, req.api_key, req.temperature)
-        evaluator = Evaluator()
+        log_query(message, session.model_type, result, model_name=session.model_name)
+    except Exception:
+        pass
+
+    return {**result, "session_id": session.session_id, "stats": stats}
+
+def open_chat_session(model_type=None, model_name=None, session_id=None):
+    model_type = model_type or get_app_config().get("llm", {}).get("default_model", "gemma")
+    if model_type not in ("gemma", "qwen"):
+        raise HTTPException(status_code=400, detail="Chat sessions need an Ollama model (gemma or qwen)")
+    _, actual_model_name = get_model_instance(model_type, model_name)
+    return get_chat_sessions().create(model_type, actual_model_name, session_id=session_id)
+
+@app.post("/chat/sessions")
+def create_chat_session(req: ChatSessionRequest):
+    return open_chat_session(req.model_type, req.model_name).summary()
+
+@app.get("/chat/{session_id}")
+def get_chat_session(session_id: str):
+    session = get_chat_sessions().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Chat session not found or expired")
+    return session.summary()
+
+@app.post("/chat/{session_id}")
+def send_chat_message(session_id: str, req: ChatMessageRequest):
+    session = get_chat_sessions().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Chat session not found or expired")
+    try:
+        return chat_turn(session, req.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        y_true = []
-        y_pred = []
-        test_samples = []
+@app.delete("/chat/{session_id}")
+def delete_chat_session(session_id: str):
+    if not get_chat_sessions().delete(session_id):
+        raise HTTPException(status_code=404, detail="Chat session not found or expired")
+    return {"status": "ok"}
 
-        # Prepare dataset
-        for intent in intents_data.get("intents", []):
-            intent_name = intent["name"]
-            examples = intent.get("examples", [])
-            
-            # Sample examples
-            count = min(len(examples), req.samples_per_intent)
-            selected_examples = random.sample(examples, count)
+@app.websocket("/ws/chat")
+async def chat_websocket(websocket: WebSocket, session_id: Optional[str] = None, model_type: Optional[str] = None, model_name: Optional[str] = None):
+    """Each text frame is one user turn; each reply is the JSON NLU result for that turn."""
+    await websocket.accept()
+    try:
+        session = get_chat_sessions().get(session_id) if session_id else None
+        if session is None:
+            session = open_chat_session(model_type, model_name, session_id=session_id)
+    except HTTPException as e:
+        await websocket.send_json({"error": e.detail})
+        await websocket.close(code=1008)
+        return
 
-            for example in selected_examples:
-                test_samples.append((example, intent_name))
+    await websocket.send_json({"event": "session", **session.summary()})
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                reply = await run_in_threadpool(chat_turn, session, message)
+            except Exception as e:
+                reply = {"error": str(e), "session_id": session.session_id}
+            await websocket.send_json(reply)
+    except WebSocketDisconnect:
+        pass
 
-        # Run evaluation
-        if not test_samples:
-             return {
-                "overall_accuracy": 0.0,
-                "classification_report": {}
+@app.post("/evaluate")
+def evaluate_model(req: EvaluateRequest):
+    try:
+        if req.run_id and not EvaluationRun.valid_id(req.run_id):
+            raise HTTPException(status_code=400, detail="run_id may only contain letters, digits, '-' and '_' (max 64)")
+        if req.run_id and EvaluationRun.exists(req.run_id):
+            # Resume: reuse the stored samples and model settings
+            run = EvaluationRun.load(req.run_id)
+            settings = run.settings
+        else:
+            seed = req.seed if req.seed is not None else random.randrange(2**31)
+            settings = {
+                "samples_per_intent": req.samples_per_intent,
+                "dataset_path": req.dataset_path,
+                "model_type": req.model_type,
+                "model_name": req.model_name,
+                "temperature": req.temperature,
             }
 
-        # Run evaluation
-        print(f"Starting evaluation with {len(test_samples)} samples...")
-        for i, (text, true_intent) in enumerate(test_samples):
-            print(f"Processing sample {i+1}/{len(test_samples)}: {text[:50]}...")
-            result = model.predict(text, intents_data)
-            predicted_intent = result.get("intent", "unknown")
-            
-            y_true.append(true_intent)
-            y_pred.append(predicted_intent)
-        print("Evaluation complete.")
+            # Prepare dataset
+            if req.dataset_path:
+                # Stream large test sets and draw a stratified sample without loading them
+                test_samples = stratified_sample(resolve_dataset_path(req.dataset_path), req.samples_per_intent, seed=seed)
+            else:
+                test_samples = select_samples(get_schema_registry().current().data, req.samples_per_intent, seed)
+
+            if not test_samples:
+                return {
+                    "overall_accuracy": 0.0,
+                    "classification_report": {}
+                }
+
+            run = EvaluationRun.create(test_samples, seed, settings=settings, run_id=req.run_id)
+
+        model, _ = get_model_instance(
+            settings.get("model_type"), settings.get("model_name"), req.api_key, settings.get("temperature", 0.3)
+        )
+
+        # Only one worker may drive a run at a time; the lease is renewed per sample
+        store = get_shared_store()
+        lease_ttl = get_app_config().get("server", {}).get("eval_lease_ttl", 600)
+        # Owner is per request, so concurrent requests in the same worker also exclude each other
+        lease_owner = f"{WORKER_ID}-{uuid.uuid4().hex[:8]}"
+        if not store.acquire("eval_leases", run.run_id, lease_owner, lease_ttl):
+            raise HTTPException(status_code=409, detail=f"Evaluation run '{run.run_id}' is already running")
+        evaluator = Evaluator()
+        intents_data = get_schema_registry().current().data
 
-        metrics = evaluator.evaluate(y_true, y_pred)
-        
-        return {
-            "overall_accuracy": metrics["accuracy"],
-            "classification_report": transform_classification_report(metrics["classification_report"])
+        # Run evaluation, checkpointing every finished sample
+        try:
+            # Safe now that no other worker can be appending to this run
+            run.repair_results()
+            pending = run.pending()
+            total = len(run.samples)
+            failures = 0
+            print(f"Evaluation run {run.run_id}: {total - len(pending)}/{total} samples already done, {len(pending)} to go...")
+            for sample in pending:
+                print(f"Processing sample {sample['index']+1}/{total}: {sample['text'][:50]}...")
+                try:
+                    result, stats = model.predict_with_stats(sample["text"], intents_data)
+                except Exception as e:
+                    # Leave the sample pending; re-posting the run_id retries it
+                    failures += 1
+                    print(f"Sample {sample['index']+1} failed: {e}")
+                    continue
+                run.record(sample["index"], result, stats)
+                store.acquire("eval_leases", run.run_id, lease_owner, lease_ttl)
+        finally:
+            store.release("eval_leases", run.run_id, lease_owner)
+        print("Evaluation complete." if failures == 0 else f"Evaluation stopped with {failures} failed samples.")
+
+        completed = run.completed()
+        y_true = [completed[i]["true_intent"] for i in sorted(completed)]
+        y_pred = [completed[i]["predicted_intent"] for i in sorted(completed)]
+
+        response = {
+            "overall_accuracy": 0.0,
+            "classification_report": {},
+            "run_id": run.run_id,
+            "seed": run.seed,
+            "completed": len(completed),
+            "total": total,
+            "failed": failures,
         }
+        if y_true:
+            metrics = evaluator.evaluate(y_true, y_pred)
+            response["overall_accuracy"] = metrics["accuracy"]
+            response["classification_report"] = transform_classification_report(metrics["classification_report"])
+            response["performance"] = evaluator.evaluate_performance(
+                [dict(completed[i], intent=completed[i]["true_intent"]) for i in sorted(completed)]
+            )
+        return response
 
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/evaluate/{run_id}")
+def evaluation_status(run_id: str):
+    """Progress of a stored evaluation run."""
+    if not EvaluationRun.exists(run_id):
+        raise HTTPException(status_code=404, detail=f"Evaluation run '{run_id}' not found")
+    status = EvaluationRun.load(run_id).status()
+    status["running"] = get_shared_store().get("eval_leases", run_id) is not None
+    return status
+
 @app.post("/batch_test")
 def batch_test(req: BatchTestRequest):
     try:
         model, _ = get_model_instance(req.model_type, req.model_name, req.api_key, req.temperature)
         results = []
+        schema = get_schema_registry().current()
+        intents_data = schema.data
 
         # Find the intent data
-        target_intent = next((i for i in intents_data.get("intents", []) if i["name"] == req.intent), None)
+        target_intent = schema.get_intent(req.intent)
         if not target_intent:
              raise HTTPException(status_code=404, detail=f"Intent '{req.intent}' not found")
 
@@ -235,13 +552,16 @@ def batch_test(req: BatchTestRequest):
         selected_examples = random.sample(examples, count)
 
         for query in selected_examples:
-            prediction = model.predict(query, intents_data)
-            results.append({
+            prediction = postprocess_entities(model.predict(query, intents_data), schema)
+            item = {
                 "text": query,
                 "predicted_intent": prediction.get("intent", "unknown"),
                 "confidence": prediction.get("confidence", 0.0),
                 "entities": prediction.get("entities", {})
-            })
+            }
+            if prediction.get("entity_issues"):
+                item["entity_issues"] = prediction["entity_issues"]
+            results.append(item)
         
         return results
     except HTTPException as e:
@@ -262,6 +582,7 @@ def compare_models(req: CompareRequest):
             start_name_2 = "qwen (Not Configured)"
 
         evaluator = Evaluator()
+        intents_data = get_schema_registry().current().data
         
         test_samples = []
          # Prepare common dataset
@@ -276,33 +597,38 @@ def compare_models(req: CompareRequest):
         y_true = [t[1] for t in test_samples]
         y_pred_1 = []
         y_pred_2 = []
+        stats_1 = []
+        stats_2 = []
 
         # Predict Model 1
-        for text, _ in test_samples:
-            res1 = model_1.predict(text, intents_data)
+        for text, true_intent in test_samples:
+            res1, call_stats = model_1.predict_with_stats(text, intents_data)
             y_pred_1.append(res1.get("intent", "unknown"))
+            stats_1.append(dict(call_stats, intent=true_intent))
             
         metrics_1 = evaluator.evaluate(y_true, y_pred_1)
         
         if model_2:
-             for text, _ in test_samples:
-                res2 = model_2.predict(text, intents_data)
+             for text, true_intent in test_samples:
+                res2, call_stats = model_2.predict_with_stats(text, intents_data)
                 y_pred_2.append(res2.get("intent", "unknown"))
+                stats_2.append(dict(call_stats, intent=true_intent))
              metrics_2 = evaluator.evaluate(y_true, y_pred_2)
         else:
              metrics_2 = {"accuracy": 0, "classification_report": {}, "f1_score": 0, "precision": 0, "recall": 0}
 
-        def get_model_metrics(m):
+        def get_model_metrics(m, stats):
              return {
                  "accuracy": m["accuracy"],
                  "precision": m["precision"],
                  "recall": m["recall"],
-                 "f1": m["f1_score"]
+                 "f1": m["f1_score"],
+                 "performance": evaluator.evaluate_performance(stats)
              }
 
         return {
-            "gemma": get_model_metrics(metrics_1),
-            "qwen": get_model_metrics(metrics_2)
+            "gemma": get_model_metrics(metrics_1, stats_1),
+            "qwen": get_model_metrics(metrics_2, stats_2)
         }
 
     except Exception as e:
@@ -310,4 +636,11 @@ def compare_models(req: CompareRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    server_settings = get_app_config().get("server", {})
+    workers = int(os.getenv("NLU_WORKERS", server_settings.get("workers", 1)))
+    if workers > 1:
+        # Multiple workers need an import string so each process loads its own app
+        uvicorn.run("server:app", host=server_settings.get("host", "0.0.0.0"), port=server_settings.get("port", 8000), workers=workers)
+    else:
+        uvicorn.run(app, host=server_settings.get("host", "0.0.0.0"), port=server_settings.get("port", 8000))
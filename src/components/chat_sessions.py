@@ -0,0 +1,175 @@
+"""
+Chat Sessions
+-------------
+Server-side state for multi-turn conversations.
+
+Each session keeps its turns and the Ollama `context` returned by the
+last generation. The first turn sends the full NLU prompt (instructions
+and schema); later turns send only the new message together with the
+stored context, so Ollama reuses its cached prefix and each turn pays
+only for its own tokens.
+
+Sessions are evicted when idle for longer than `idle_ttl`, and least
+recently used sessions are dropped when the total stored context
+exceeds `max_total_tokens`.
+"""
+
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.utils import ollama_client
+from src.utils.long_input import compress_long_input
+from src.utils.prompt_template import build_chat_turn_prompt, build_nlu_prompt
+
+
+class ChatSession:
+    """
+    One conversation bound to a model.
+    """
+
+    def __init__(self, session_id: str, model_type: str, model_name: str):
+        self.session_id = session_id
+        self.model_type = model_type
+        self.model_name = model_name
+        self.turns: List[Dict] = []
+        # Token ids from Ollama; array('i') is ~7x smaller than a list of ints
+        self.context = array("i")
+        self.schema_version: Optional[str] = None
+        self.created_at = time.time()
+        self.last_active = time.time()
+        self.lock = threading.Lock()
+
+    @property
+    def context_tokens(self) -> int:
+        return len(self.context)
+
+    def transcript(self) -> str:
+        return "\n".join(f"User: {turn['message']}" for turn in self.turns)
+
+    def summary(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "model_type": self.model_type,
+            "model": self.model_name,
+            "turns": len(self.turns),
+            "context_tokens": self.context_tokens,
+            "created_at": self.created_at,
+            "last_active": self.last_active,
+        }
+
+
+class ChatSessionManager:
+    """
+    In-memory session store with idle and memory-based eviction.
+    """
+
+    def __init__(self, max_sessions: int = 1000, idle_ttl: float = 900, max_total_tokens: int = 2_000_000):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_total_tokens = max_total_tokens
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, model_type: str, model_name: str, session_id: Optional[str] = None) -> ChatSession:
+        session = ChatSession(session_id or uuid.uuid4().hex, model_type, model_name)
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._evict_locked()
+        return session
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        with self._lock:
+            self._evict_locked()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "context_tokens": sum(s.context_tokens for s in self._sessions.values()),
+                "max_total_tokens": self.max_total_tokens,
+            }
+
+    def _evict_locked(self):
+        now = time.time()
+        for session_id in [sid for sid, s in self._sessions.items() if now - s.last_active > self.idle_ttl]:
+            del self._sessions[session_id]
+
+        total = sum(s.context_tokens for s in self._sessions.values())
+        while self._sessions and (total > self.max_total_tokens or len(self._sessions) > self.max_sessions):
+            _, oldest = self._sessions.popitem(last=False)
+            total -= oldest.context_tokens
+
+
+def run_turn(
+    session: ChatSession,
+    model,
+    message: str,
+    schema,
+    max_session_tokens: int = 8192,
+    options: Optional[Dict] = None,
+) -> Tuple[dict, Dict]:
+    """
+    Process one user turn, reusing the session's cached context.
+
+    Args:
+        session (ChatSession): Conversation state
+        model (BaseNLUModel): Backend whose _safe_parse normalizes the output
+        message (str): New user message
+        schema (SchemaSnapshot): Current intent schema
+        max_session_tokens (int): Context size after which the session is re-primed
+            with a compressed transcript
+        options (Dict): Ollama generation options
+
+    Returns:
+        Tuple[dict, Dict]: NLU result and turn statistics
+    """
+    with session.lock:
+        restarted = False
+        if session.schema_version != schema.version or session.context_tokens > max_session_tokens:
+            # Schema changed or context too long: start a fresh context from a condensed transcript
+            restarted = bool(session.turns)
+            session.context = array("i")
+            session.schema_version = schema.version
+
+        if session.context_tokens == 0:
+            history = session.transcript()
+            if history:
+                history, _ = compress_long_input(history, max_session_tokens // 2)
+                prompt = build_nlu_prompt(f"{history}\nUser: {message}", schema.data)
+            else:
+                prompt = build_nlu_prompt(message, schema.data)
+            context = None
+        else:
+            prompt = build_chat_turn_prompt(message)
+            context = session.context
+
+        start = time.perf_counter()
+        response = ollama_client.generate(session.model_name, prompt, context=context, options=options)
+        latency = time.perf_counter() - start
+
+        session.context = array("i", response.get("context") or [])
+        result = model._safe_parse(response.get("response", ""))
+        session.turns.append({"message": message, "intent": result.get("intent")})
+        session.last_active = time.time()
+
+        stats = {
+            "turn": len(session.turns),
+            "latency": latency,
+            "prompt_eval_tokens": response.get("prompt_eval_count", 0),
+            "output_tokens": response.get("eval_count", 0),
+            "context_tokens": session.context_tokens,
+            "context_restarted": restarted,
+        }
+        return result, stats
@@ -0,0 +1,192 @@
+"""
+Dataset Component
+-----------------
+Streams labelled NLU test sets (CSV, JSONL, Parquet) through pyarrow in
+record batches, so corpora with hundreds of thousands of rows can feed
+the evaluation engine without being loaded into memory.
+
+Sampling is deterministic: each row is ranked by a seeded hash of its
+text and the lowest-ranked rows per intent are kept, which gives the
+same stratified sample for the same seed regardless of file order or
+batch size.
+"""
+
+import hashlib
+import heapq
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+# pyarrow (and numpy) are imported where used; they add ~130 ms to server start-up
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+TEXT_COLUMNS = ("text", "message", "utterance", "query")
+LABEL_COLUMNS = ("intent", "true_intent", "label")
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+
+def detect_format(path: str) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Unsupported dataset format '{suffix}'. Use CSV, JSONL or Parquet.")
+    return FORMATS[suffix]
+
+
+def _string_fields(row: dict) -> dict:
+    """Read text and label fields as strings, like the CSV reader, so mixed str/int values fit one column type."""
+    for name in TEXT_COLUMNS + LABEL_COLUMNS:
+        value = row.get(name)
+        if value is not None and not isinstance(value, str):
+            row[name] = str(value)
+    return row
+
+
+def iter_record_batches(path: str, batch_size: int = 10000) -> Iterator["pa.RecordBatch"]:
+    """
+    Yield record batches from a CSV, JSONL or Parquet file.
+
+    Args:
+        path (str): Dataset file
+        batch_size (int): Approximate rows per batch
+
+    Yields:
+        pa.RecordBatch: Consecutive batches of the file
+    """
+    import pyarrow as pa
+
+    if not Path(path).exists():
+        raise FileNotFoundError(f"File not found: {path}")
+
+    fmt = detect_format(path)
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+
+    elif fmt == "csv":
+        import pyarrow.csv as pacsv
+
+        # Block size is in bytes; ~128 bytes per row is typical for short utterances
+        read_options = pacsv.ReadOptions(block_size=max(1 << 16, batch_size * 128))
+        convert_options = pacsv.ConvertOptions(
+            column_types={name: pa.string() for name in TEXT_COLUMNS + LABEL_COLUMNS}
+        )
+        reader = pacsv.open_csv(path, read_options=read_options, convert_options=convert_options)
+        for batch in reader:
+            if batch.num_rows:
+                yield batch
+
+    else:
+        rows = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                rows.append(_string_fields(json.loads(line)))
+                if len(rows) >= batch_size:
+                    yield pa.RecordBatch.from_pylist(rows)
+                    rows = []
+        if rows:
+            yield pa.RecordBatch.from_pylist(rows)
+
+
+def _resolve_column(schema: "pa.Schema", candidates: Tuple[str, ...], required: bool = True) -> Optional[str]:
+    for name in candidates:
+        if name in schema.names:
+            return name
+    if required:
+        raise ValueError(f"Dataset needs one of the columns {list(candidates)}, found {schema.names}")
+    return None
+
+
+def iter_samples(path: str, batch_size: int = 10000, labelled: bool = True) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Yield (text, intent) pairs from a dataset file.
+
+    With labelled=False the label column is optional and intent may be None.
+    """
+    for batch in iter_record_batches(path, batch_size):
+        text_col = _resolve_column(batch.schema, TEXT_COLUMNS)
+        label_col = _resolve_column(batch.schema, LABEL_COLUMNS, required=labelled)
+
+        texts = batch.column(text_col).to_pylist()
+        labels = batch.column(label_col).to_pylist() if label_col else [None] * len(texts)
+
+        for text, label in zip(texts, labels):
+            if text is None or (labelled and label is None):
+                continue
+            yield str(text), (str(label) if label is not None else None)
+
+
+def intent_counts(path: str, batch_size: int = 10000) -> Dict[str, int]:
+    """
+    Count rows per intent in a single streaming pass.
+    """
+    import pyarrow.compute as pc
+
+    counts: Dict[str, int] = {}
+    for batch in iter_record_batches(path, batch_size):
+        label_col = _resolve_column(batch.schema, LABEL_COLUMNS)
+        for item in pc.value_counts(batch.column(label_col)).to_pylist():
+            if item["values"] is None:
+                continue
+            counts[item["values"]] = counts.get(item["values"], 0) + item["counts"]
+    return counts
+
+
+def _rank(seed: int, text: str) -> int:
+    digest = hashlib.blake2b(f"{seed}:{text}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def stratified_sample(
+    path: str,
+    samples_per_intent: int,
+    seed: int = 0,
+    intents: Optional[List[str]] = None,
+    batch_size: int = 10000,
+) -> List[Tuple[str, str]]:
+    """
+    Draw up to samples_per_intent rows per intent in one streaming pass.
+
+    Memory is bounded by (number of intents x samples_per_intent).
+
+    Args:
+        path (str): Dataset file
+        samples_per_intent (int): Rows kept per intent
+        seed (int): Sampling seed
+        intents (List[str]): Optional allow-list of intents
+        batch_size (int): Rows per record batch
+
+    Returns:
+        List[Tuple[str, str]]: (text, intent) pairs grouped by intent
+    """
+    allowed = set(intents) if intents else None
+    # Per intent, a max-heap (negated ranks) holding the k lowest ranks seen so far
+    heaps: Dict[str, List[Tuple[int, str]]] = {}
+
+    for text, intent in iter_samples(path, batch_size):
+        if allowed is not None and intent not in allowed:
+            continue
+        heap = heaps.setdefault(intent, [])
+        rank = _rank(seed, text)
+        if len(heap) < samples_per_intent:
+            heapq.heappush(heap, (-rank, text))
+        elif -heap[0][0] > rank:
+            heapq.heapreplace(heap, (-rank, text))
+
+    samples = []
+    for intent in sorted(heaps):
+        for _, text in sorted(heaps[intent], reverse=True):
+            samples.append((text, intent))
+    return samples
@@ -0,0 +1,170 @@
+"""
+Distillation Pipeline
+---------------------
+Trains a compact local intent classifier from the LLM's own production
+labels (logs/history.jsonl) plus the curated examples in intents.json.
+
+Only history entries labelled by an LLM (not by the distilled model
+itself) whose confidence clears a threshold and whose intent exists in
+the current schema are used. The classifier (TF-IDF
+word and character n-grams + logistic regression) is scored against the
+LLM labels on a held-out split with the standard Evaluator and saved
+with joblib for the DistilledNLU backend.
+
+Usage:
+    python -m src.components.distill --min-confidence 0.8
+"""
+
+import argparse
+import hashlib
+import json
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from src.components.evaluator import Evaluator
+from src.components.json_loader import load_intents
+from src.utils.logger import LOG_FILE
+
+DEFAULT_MODEL_PATH = Path("models/distilled_intent.joblib")
+
+
+def load_history_labels(log_path: Path, intent_names: List[str], min_confidence: float) -> List[Tuple[str, str]]:
+    """
+    Read (message, intent) pairs the LLM labelled with high confidence.
+    Answers from the distilled model itself are skipped, so it never
+    trains on its own output. Repeated messages keep their most recent label.
+    """
+    allowed = set(intent_names)
+    labels: Dict[str, str] = {}
+    if not Path(log_path).exists():
+        return []
+
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("model_type") == "distilled":
+                # Only its LLM fallback answers are labels; older entries without answered_by are ambiguous
+                if (entry.get("result") or {}).get("answered_by") in (None, "distilled"):
+                    continue
+            message = (entry.get("message") or "").strip()
+            intent = entry.get("intent")
+            confidence = entry.get("confidence")
+            if confidence is None:
+                confidence = (entry.get("result") or {}).get("confidence")
+            if not message or intent not in allowed or confidence is None:
+                continue
+            if float(confidence) >= min_confidence:
+                labels[message] = intent
+
+    return list(labels.items())
+
+
+def build_pipeline():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import FeatureUnion, Pipeline
+
+    features = FeatureUnion([
+        ("word", TfidfVectorizer(analyzer="word", ngram_range=(1, 2), lowercase=True, sublinear_tf=True)),
+        ("char", TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 5), lowercase=True, sublinear_tf=True)),
+    ])
+    return Pipeline([
+        ("features", features),
+        ("classifier", LogisticRegression(max_iter=2000, C=10.0)),
+    ])
+
+
+def train(
+    intents_path: str = "data/raw_data/intents.json",
+    log_path: Path = LOG_FILE,
+    output_path: Path = DEFAULT_MODEL_PATH,
+    min_confidence: float = 0.8,
+    test_size: float = 0.2,
+    seed: int = 42,
+) -> Dict:
+    """
+    Train, evaluate and save the distilled classifier.
+
+    Returns:
+        Dict: Training metadata, including held-out agreement with the LLM
+    """
+    import joblib
+
+    intents_data = load_intents(intents_path)
+    intent_names = [intent["name"] for intent in intents_data["intents"]]
+
+    schema_rows = [(example, intent["name"]) for intent in intents_data["intents"] for example in intent["examples"]]
+    history_rows = load_history_labels(log_path, intent_names, min_confidence)
+
+    # Hold out part of the LLM-labelled traffic to measure agreement with the LLM;
+    # without enough history, hold out curated examples instead
+    rng = random.Random(seed)
+    holdout_source = history_rows if len(history_rows) >= 20 else schema_rows
+    shuffled = holdout_source[:]
+    rng.shuffle(shuffled)
+    n_test = max(1, int(len(shuffled) * test_size))
+    test_rows = shuffled[:n_test]
+    held_out = {text for text, _ in test_rows}
+    train_rows = [row for row in schema_rows + history_rows if row[0] not in held_out]
+
+    pipeline = build_pipeline()
+    pipeline.fit([text for text, _ in train_rows], [label for _, label in train_rows])
+
+    evaluator = Evaluator()
+    y_true = [label for _, label in test_rows]
+    y_pred = list(pipeline.predict([text for text, _ in test_rows]))
+    metrics = evaluator.evaluate(y_true, y_pred)
+
+    # Refit on everything for the published model
+    all_rows = schema_rows + history_rows
+    pipeline.fit([text for text, _ in all_rows], [label for _, label in all_rows])
+
+    with open(intents_path, "rb") as f:
+        schema_version = hashlib.sha256(f.read()).hexdigest()[:16]
+
+    metadata = {
+        "trained_at": datetime.now().isoformat(),
+        "schema_version": schema_version,
+        "min_confidence": min_confidence,
+        "schema_examples": len(schema_rows),
+        "history_examples": len(history_rows),
+        "holdout_source": "history" if holdout_source is history_rows else "schema",
+        "holdout_size": len(test_rows),
+        "holdout_accuracy": metrics["accuracy"],
+        "holdout_f1": metrics["f1_score"],
+    }
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump({"pipeline": pipeline, "metadata": metadata}, output_path)
+    with open(output_path.with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+
+    return metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a distilled intent classifier from LLM history")
+    parser.add_argument("--intents", default="data/raw_data/intents.json")
+    parser.add_argument("--history", default=str(LOG_FILE))
+    parser.add_argument("--output", default=str(DEFAULT_MODEL_PATH))
+    parser.add_argument("--min-confidence", type=float, default=0.8)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    metadata = train(args.intents, Path(args.history), Path(args.output), args.min_confidence, args.test_size, args.seed)
+
+    print("Distilled model saved to", args.output)
+    print(f"Training data: {metadata['schema_examples']} schema examples + {metadata['history_examples']} history labels")
+    print(f"Held-out agreement with LLM labels ({metadata['holdout_source']}, n={metadata['holdout_size']}): "
+          f"accuracy {metadata['holdout_accuracy']:.2%}, F1 {metadata['holdout_f1']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# src/components/distilled_nlu.py
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from src.components.llm_base import BaseNLUModel
+
+# Loaded artifacts keyed by (path, mtime), shared by every DistilledNLU in the process
+_ARTIFACTS: Dict[Tuple[str, int], dict] = {}
+_ARTIFACTS_LOCK = threading.Lock()
+
+
+def artifact_version(model_path: str) -> str:
+    """Changes whenever the model file is retrained; used to version cached predictions."""
+    try:
+        return str(os.stat(model_path).st_mtime_ns)
+    except FileNotFoundError:
+        return "missing"
+
+
+def load_artifact(model_path: str) -> dict:
+    """
+    Load a distilled model once per file version; a retrained file is picked up on the next call.
+    """
+    path = str(Path(model_path).resolve())
+    try:
+        key = (path, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"Distilled model not found at {model_path}. Train it with: python -m src.components.distill"
+        )
+    artifact = _ARTIFACTS.get(key)
+    if artifact is None:
+        with _ARTIFACTS_LOCK:
+            artifact = _ARTIFACTS.get(key)
+            if artifact is None:
+                import joblib
+
+                artifact = joblib.load(path)
+                # Keep only the latest version of each file
+                for stale in [k for k in _ARTIFACTS if k[0] == path]:
+                    del _ARTIFACTS[stale]
+                _ARTIFACTS[key] = artifact
+    return artifact
+
+
+class DistilledNLU(BaseNLUModel):
+    """
+    Local intent classifier trained by src/components/distill.py.
+
+    Predictions below `min_confidence` are delegated to `fallback_model`
+    (an LLM backend) when one is given, so confident traffic is served
+    without any LLM call. `answered_by` in the result names the backend
+    that produced it ("distilled" or the fallback model's name).
+    """
+
+    def __init__(self, model_path: str, fallback_model: Optional[BaseNLUModel] = None, min_confidence: float = 0.7):
+        super().__init__(Path(model_path).stem)
+        self.model_path = model_path
+        self.fallback_model = fallback_model
+        self.min_confidence = min_confidence
+
+    @property
+    def metadata(self) -> dict:
+        return self._load()["metadata"]
+
+    @property
+    def cache_version(self) -> str:
+        return artifact_version(self.model_path)
+
+    def _load(self) -> dict:
+        return load_artifact(self.model_path)
+
+    def predict(self, text, intents_schema):
+        pipeline = self._load()["pipeline"]
+        probabilities = pipeline.predict_proba([text])[0]
+        best = probabilities.argmax()
+        intent = str(pipeline.classes_[best])
+        confidence = float(probabilities[best])
+
+        if confidence < self.min_confidence and self.fallback_model is not None:
+            result = self.fallback_model.predict(text, intents_schema)
+            self._record_call(**getattr(self.fallback_model._call_stats, "values", {}))
+            if isinstance(result, dict):
+                # Logged with the result, so distillation can tell LLM labels from our own
+                result["answered_by"] = self.fallback_model.model_name
+            return result
+
+        self._record_call(prompt_tokens=0, output_tokens=0, parse_outcome="json")
+        return {
+            "intent": intent,
+            "confidence": confidence,
+            "answered_by": "distilled",
+            "entities": self._extract_entities(text, intent, intents_schema),
+            "response": f"Sure, I can help you {intent.replace('_', ' ')}. Could you share any remaining details?"
+        }
+
+    def _extract_entities(self, text: str, intent: str, intents_schema: dict) -> dict:
+        """
+        Match known entity values from the schema, limited to the intent's entity types.
+        """
+        intent_obj = next((i for i in intents_schema.get("intents", []) if i["name"] == intent), None)
+        allowed = intent_obj.get("entities", []) if intent_obj else []
+        entities = {}
+        for entity_type in allowed:
+            for value in intents_schema.get("entities", {}).get(entity_type, []):
+                if re.search(rf"\b{re.escape(value)}\b", text, re.IGNORECASE):
+                    entities[entity_type] = value
+                    break
+        return entities
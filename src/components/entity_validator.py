@@ -0,0 +1,215 @@
+"""
+Entity Validator
+----------------
+Post-processes the `entities` returned by a backend against the intent
+schema, so responses leave the server already checked and in one
+canonical form.
+
+- Keys are normalized ("Order ID" -> "order_id") and must be entity
+  types allowed for the predicted intent. For intents outside the schema
+  (e.g. "unknown"), any entity type defined in the schema is accepted.
+- Values are normalized per type with precompiled patterns and lookup
+  tables: dates, times, amounts, order IDs and quantities get a
+  canonical form, and known schema values get their schema spelling.
+- Anything dropped is reported as an issue rather than raising.
+
+A validator is built once per schema version. Every path that returns
+predictions (server, bulk pipeline, Streamlit app) goes through
+`validate_result`:
+
+    result = validate_result(result, snapshot)
+"""
+
+import re
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+_KEY_RE = re.compile(r"[^a-z0-9]+")
+
+_NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+_WORDS_BY_NUMBER = {value: word for word, value in _NUMBER_WORDS.items()}
+
+_WEEKDAYS = {day.lower(): day for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")}
+_RELATIVE_DATES = {"today": "today", "tonight": "today", "tomorrow": "tomorrow", "tmrw": "tomorrow",
+                   "yesterday": "yesterday", "next week": "next week", "this week": "this week"}
+_ISO_DATE_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+# Day first, as users in our locales write 05/03/2025 for 5 March
+_DMY_DATE_RE = re.compile(r"^(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4})$")
+
+_TIME_RE = re.compile(r"^(\d{1,2})(?:[:.](\d{2}))?\s*([ap])\.?\s*m\.?$", re.IGNORECASE)
+_TIME_24H_RE = re.compile(r"^(\d{1,2})[:.](\d{2})$")
+
+_AMOUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(k|thousand|lakh|lakhs|l|cr|crore|crores)?\b", re.IGNORECASE)
+_AMOUNT_NOISE_RE = re.compile(r"[,\s]|rs\.?|inr|rupees?|usd|dollars?|[₹$€£]", re.IGNORECASE)
+_AMOUNT_SCALE = {"k": 1_000, "thousand": 1_000, "lakh": 100_000, "lakhs": 100_000, "l": 100_000,
+                 "cr": 10_000_000, "crore": 10_000_000, "crores": 10_000_000}
+
+_ORDER_ID_RE = re.compile(r"^(?:ord(?:er)?)?[\s#:-]*(\d{3,})$", re.IGNORECASE)
+
+
+def normalize_key(key: str) -> str:
+    return _KEY_RE.sub("_", str(key).strip().lower()).strip("_")
+
+
+def normalize_date(value: str) -> Optional[str]:
+    lowered = value.strip().lower()
+    if lowered in _RELATIVE_DATES:
+        return _RELATIVE_DATES[lowered]
+    if lowered in _WEEKDAYS:
+        return _WEEKDAYS[lowered]
+    match = _ISO_DATE_RE.match(lowered)
+    if match:
+        year, month, day = (int(part) for part in match.groups())
+    else:
+        match = _DMY_DATE_RE.match(lowered)
+        if not match:
+            # Free-form dates ("5th March") are passed through unchanged
+            return value.strip()
+        day, month, year = (int(part) for part in match.groups())
+        if year < 100:
+            year += 2000
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+def normalize_time(value: str) -> Optional[str]:
+    text = value.strip()
+    match = _TIME_RE.match(text)
+    if match:
+        hour, minute, half = int(match.group(1)), int(match.group(2) or 0), match.group(3).upper()
+        if not (1 <= hour <= 12 and minute < 60):
+            return None
+    else:
+        match = _TIME_24H_RE.match(text)
+        if not match:
+            return text
+        hour, minute = int(match.group(1)), int(match.group(2))
+        if not (hour < 24 and minute < 60):
+            return None
+        half = "A" if hour < 12 else "P"
+        hour = hour % 12 or 12
+    return f"{hour}:{minute:02d} {half}M" if minute else f"{hour} {half}M"
+
+
+def normalize_amount(value: str) -> Optional[str]:
+    match = _AMOUNT_RE.search(_AMOUNT_NOISE_RE.sub("", value))
+    if not match:
+        word = _NUMBER_WORDS.get(value.strip().lower())
+        return str(word) if word is not None else None
+    amount = float(match.group(1)) * _AMOUNT_SCALE.get((match.group(2) or "").lower(), 1)
+    return str(int(amount)) if amount.is_integer() else f"{amount:.2f}"
+
+
+def normalize_order_id(value: str) -> Optional[str]:
+    match = _ORDER_ID_RE.match(value.strip())
+    return f"ORD{match.group(1)}" if match else None
+
+
+def normalize_quantity(value: str) -> Optional[str]:
+    text = value.strip().lower()
+    if text in _NUMBER_WORDS:
+        return text
+    if text.isdigit():
+        return _WORDS_BY_NUMBER.get(int(text), text)
+    return None
+
+
+NORMALIZERS: Dict[str, Callable[[str], Optional[str]]] = {
+    "date": normalize_date,
+    "time": normalize_time,
+    "amount": normalize_amount,
+    "order_id": normalize_order_id,
+    "quantity": normalize_quantity,
+}
+
+
+class EntityValidator:
+    """
+    Entity checks and normalizers compiled for one schema snapshot.
+    """
+
+    def __init__(self, snapshot):
+        self.entity_types = frozenset(snapshot.entity_types)
+        self.allowed_by_intent: Dict[str, frozenset] = {
+            name: frozenset(intent.get("entities", [])) for name, intent in snapshot.intents_by_name.items()
+        }
+        # Case-insensitive lookup of schema values to their schema spelling
+        self.known_values: Dict[str, Dict[str, str]] = {
+            entity_type: {str(value).lower(): str(value) for value in values}
+            for entity_type, values in snapshot.entity_types.items()
+        }
+
+    def normalize_value(self, entity_type: str, value) -> Optional[str]:
+        if value is None:
+            return None
+        text = str(value).strip()
+        if not text:
+            return None
+        known = self.known_values.get(entity_type, {}).get(text.lower())
+        if known is not None:
+            return known
+        normalizer = NORMALIZERS.get(entity_type)
+        return normalizer(text) if normalizer else text
+
+    def process(self, intent: str, entities) -> Tuple[Dict, List[str]]:
+        """
+        Validate and normalize a backend's entities for the predicted intent.
+
+        Returns:
+            Tuple[Dict, List[str]]: Clean entities and a list of issues for anything dropped
+        """
+        if not entities:
+            return {}, []
+        if not isinstance(entities, dict):
+            return {}, [f"entities must be an object, got {type(entities).__name__}"]
+
+        allowed = self.allowed_by_intent.get(intent, self.entity_types)
+        clean: Dict = {}
+        issues: List[str] = []
+        for raw_key, raw_value in entities.items():
+            key = normalize_key(raw_key)
+            if key not in allowed:
+                issues.append(f"'{raw_key}' is not an entity of intent '{intent}'")
+                continue
+
+            values = raw_value if isinstance(raw_value, list) else [raw_value]
+            normalized = []
+            for value in values:
+                result = self.normalize_value(key, value)
+                if result is None:
+                    if value not in (None, ""):
+                        issues.append(f"invalid {key} '{value}'")
+                else:
+                    normalized.append(result)
+            if normalized:
+                clean[key] = normalized if isinstance(raw_value, list) else normalized[0]
+        return clean, issues
+
+
+def validate_result(result, snapshot):
+    """
+    Validate and normalize a prediction's entities in place, using the
+    snapshot's compiled validator. A non-string intent becomes "unknown".
+    Dropped entities are listed in result["entity_issues"].
+    """
+    if not isinstance(result, dict):
+        return result
+    issues: List[str] = []
+    intent = result.get("intent")
+    if not isinstance(intent, str):
+        # Backends occasionally return a list or number here; nothing downstream can use it
+        if intent is not None:
+            issues.append(f"intent must be a string, got {type(intent).__name__}")
+        intent = result["intent"] = "unknown"
+    validator = snapshot.derive("entity_validator", EntityValidator)
+    entities, entity_issues = validator.process(intent, result.get("entities"))
+    issues.extend(entity_issues)
+    result["entities"] = entities
+    if issues:
+        result["entity_issues"] = issues
+    return result
@@ -0,0 +1,209 @@
+"""
+Evaluation Runs
+---------------
+Reproducible, resumable evaluation runs.
+
+A run stores its seed, settings and the exact list of samples in a
+manifest, and appends one line per finished prediction to a results
+file. If the process dies, loading the run again skips every sample
+that already has a result, so no finished LLM call is repeated.
+
+Layout:
+    logs/eval_runs/<run_id>/manifest.json
+    logs/eval_runs/<run_id>/results.jsonl
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+RUNS_DIR = Path("logs/eval_runs")
+
+_RUN_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def select_samples(intents_data: dict, samples_per_intent: int, seed: int) -> List[Tuple[str, str]]:
+    """
+    Pick up to samples_per_intent examples per intent with a seeded RNG.
+    """
+    rng = random.Random(seed)
+    samples = []
+    for intent in intents_data.get("intents", []):
+        examples = intent.get("examples", [])
+        count = min(len(examples), samples_per_intent)
+        for example in rng.sample(examples, count):
+            samples.append((example, intent["name"]))
+    return samples
+
+
+class EvaluationRun:
+    """
+    A single checkpointed evaluation run.
+    """
+
+    def __init__(self, run_id: str, runs_dir: Path = RUNS_DIR):
+        if not self.valid_id(run_id):
+            raise ValueError("run_id may only contain letters, digits, '-' and '_'")
+        self.run_id = run_id
+        self.run_dir = Path(runs_dir) / run_id
+        self.manifest_path = self.run_dir / "manifest.json"
+        self.results_path = self.run_dir / "results.jsonl"
+        self._lock = threading.Lock()
+        self.manifest: Dict = {}
+
+    @staticmethod
+    def valid_id(run_id: str) -> bool:
+        return _RUN_ID_RE.match(run_id) is not None
+
+    @classmethod
+    def exists(cls, run_id: str, runs_dir: Path = RUNS_DIR) -> bool:
+        return cls.valid_id(run_id) and (Path(runs_dir) / run_id / "manifest.json").exists()
+
+    @classmethod
+    def create(
+        cls,
+        samples: List[Tuple[str, str]],
+        seed: int,
+        settings: Optional[Dict] = None,
+        run_id: Optional[str] = None,
+        runs_dir: Path = RUNS_DIR,
+    ) -> "EvaluationRun":
+        """
+        Create a run and persist its sample manifest.
+
+        Args:
+            samples (List[Tuple[str, str]]): (text, true_intent) pairs in evaluation order
+            seed (int): Seed used to select the samples
+            settings (Dict): Model and sampling settings, stored for resume
+            run_id (str): Optional id; generated when omitted
+        """
+        run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        run = cls(run_id, runs_dir)
+        if run.manifest_path.exists():
+            raise ValueError(f"Evaluation run '{run_id}' already exists")
+
+        run.run_dir.mkdir(parents=True, exist_ok=True)
+        run.manifest = {
+            "run_id": run_id,
+            "created_at": datetime.now().isoformat(),
+            "seed": seed,
+            "settings": settings or {},
+            "samples": [{"index": i, "text": text, "intent": intent} for i, (text, intent) in enumerate(samples)],
+        }
+
+        # Write-then-rename so a crash never leaves a half-written manifest
+        tmp_path = run.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(run.manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, run.manifest_path)
+        return run
+
+    @classmethod
+    def load(cls, run_id: str, runs_dir: Path = RUNS_DIR) -> "EvaluationRun":
+        """Read a run's manifest; never modifies the run, so status polls are safe."""
+        run = cls(run_id, runs_dir)
+        if not run.manifest_path.exists():
+            raise FileNotFoundError(f"Evaluation run '{run_id}' not found")
+        with open(run.manifest_path, "r", encoding="utf-8") as f:
+            run.manifest = json.load(f)
+        return run
+
+    def repair_results(self, block_size: int = 65536):
+        """
+        Cut results.jsonl back to its last newline, so a line torn by a crash
+        is not glued onto the next record (which would lose that record too).
+
+        Call only while holding the run's lease: otherwise this could cut a
+        line another worker is still writing.
+        """
+        if not self.results_path.exists():
+            return
+        with open(self.results_path, "r+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - block_size)
+                f.seek(start)
+                block = f.read(position - start)
+                newline = block.rfind(b"\n")
+                if newline != -1:
+                    keep = start + newline + 1
+                    break
+                position = start
+            else:
+                keep = 0
+            if keep < end:
+                f.truncate(keep)
+
+    @property
+    def seed(self) -> int:
+        return self.manifest["seed"]
+
+    @property
+    def settings(self) -> Dict:
+        return self.manifest.get("settings", {})
+
+    @property
+    def samples(self) -> List[Dict]:
+        return self.manifest["samples"]
+
+    def completed(self) -> Dict[int, Dict]:
+        """
+        Return finished results keyed by sample index.
+        A torn last line (crash mid-write) is ignored and recomputed.
+        """
+        results: Dict[int, Dict] = {}
+        if not self.results_path.exists():
+            return results
+        with open(self.results_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                results[record["index"]] = record
+        return results
+
+    def pending(self) -> List[Dict]:
+        done = self.completed()
+        return [sample for sample in self.samples if sample["index"] not in done]
+
+    def record(self, index: int, result: Dict, stats: Optional[Dict] = None):
+        """
+        Checkpoint one finished sample, with its call statistics, to disk.
+        """
+        sample = self.samples[index]
+        entry = {
+            "index": index,
+            "text": sample["text"],
+            "true_intent": sample["intent"],
+            "predicted_intent": result.get("intent", "unknown"),
+            "confidence": result.get("confidence"),
+        }
+        if stats:
+            entry.update(stats)
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.results_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def status(self) -> Dict:
+        completed = len(self.completed())
+        total = len(self.samples)
+        return {
+            "run_id": self.run_id,
+            "seed": self.seed,
+            "settings": self.settings,
+            "created_at": self.manifest.get("created_at"),
+            "total": total,
+            "completed": completed,
+            "done": completed >= total,
+        }
@@ -6,7 +6,21 @@ Designed to be model-agnostic and reusable across LLM backends.
 """
 
 from typing import List, Dict
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, precision_score, recall_score, f1_score
+
+FALLBACK_OUTCOMES = ("raw_text", "fallback", "error")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Linear-interpolated percentile (q in 0-100) of a list of numbers.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
 
 
 class Evaluator:
@@ -17,6 +31,14 @@ class Evaluator:
     def __init__(self):
         pass
 
+    @staticmethod
+    def warm_up():
+        """
+        Import the metric backend ahead of the first evaluation.
+        sklearn is imported lazily because it dominates process start-up time.
+        """
+        import sklearn.metrics  # noqa: F401
+
     def evaluate(self, y_true: List[str], y_pred: List[str]) -> Dict:
         """
         Evaluate predicted labels against ground truth labels.
@@ -29,6 +51,8 @@ class Evaluator:
             Dict: Evaluation results including accuracy and reports
         """
 
+        from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, precision_score, recall_score, f1_score
+
         if len(y_true) != len(y_pred):
             raise ValueError("y_true and y_pred must be of the same length")
 
@@ -42,3 +66,47 @@ class Evaluator:
         }
 
         return results
+
+    def evaluate_performance(self, records: List[Dict]) -> Dict:
+        """
+        Summarize per-prediction cost statistics.
+
+        Args:
+            records (List[Dict]): One entry per prediction with "intent" (true label),
+                "latency" (seconds), "prompt_tokens", "output_tokens" and "parse_outcome"
+
+        Returns:
+            Dict: Latency percentiles, token usage, throughput and fallback rates,
+                overall and per intent
+        """
+
+        def summarize(group: List[Dict]) -> Dict:
+            latencies = [r.get("latency", 0.0) for r in group]
+            output_tokens = sum(r.get("output_tokens", 0) for r in group)
+            prompt_tokens = sum(r.get("prompt_tokens", 0) for r in group)
+            total_latency = sum(latencies)
+            fallbacks = sum(1 for r in group if r.get("parse_outcome") in FALLBACK_OUTCOMES)
+            return {
+                "samples": len(group),
+                "latency_mean": total_latency / len(group) if group else 0.0,
+                "latency_p50": percentile(latencies, 50),
+                "latency_p95": percentile(latencies, 95),
+                "latency_p99": percentile(latencies, 99),
+                "prompt_tokens_mean": prompt_tokens / len(group) if group else 0.0,
+                "output_tokens_mean": output_tokens / len(group) if group else 0.0,
+                "tokens_per_sec": output_tokens / total_latency if total_latency else 0.0,
+                "fallback_rate": fallbacks / len(group) if group else 0.0,
+            }
+
+        results = summarize(records)
+
+        outcomes: Dict[str, int] = {}
+        by_intent: Dict[str, List[Dict]] = {}
+        for record in records:
+            outcome = record.get("parse_outcome", "json")
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            by_intent.setdefault(record.get("intent", "unknown"), []).append(record)
+
+        results["parse_outcomes"] = outcomes
+        results["per_intent"] = {intent: summarize(group) for intent, group in sorted(by_intent.items())}
+        return results
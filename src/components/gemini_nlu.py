@@ -1,38 +1,75 @@
 import json
 import re
-import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from src.components.llm_base import BaseNLUModel
 from src.utils.prompt_template import build_nlu_prompt
+from src.utils.token_counter import count_tokens
+from src.utils.rate_limiter import call_with_retry, get_rate_limiter
 
 
 class GeminiNLU(BaseNLUModel):
 
-    def __init__(self, model_name: str, api_key: str, temperature: float = 0.3):
+    def __init__(
+        self,
+        model_name: str,
+        api_key: str,
+        temperature: float = 0.3,
+        requests_per_minute: float = 15,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        endpoint: Optional[str] = None,
+    ):
         super().__init__(model_name)
-        genai.configure(api_key=api_key)
+        # Imported here: the Gemini SDK is slow to import and only needed when Gemini is selected
+        import google.generativeai as genai
+
+        self._genai = genai
+        if endpoint:
+            # e.g. "http://127.0.0.1:8765" for a local fake server
+            genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+        else:
+            genai.configure(api_key=api_key)
         self.model_name = model_name
         self.temperature = temperature
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
         self.model = genai.GenerativeModel(model_name)
+        # Shared by every instance using the same key and model, so they pace one quota together
+        self.rate_limiter = get_rate_limiter(api_key, model_name, requests_per_minute, max_concurrency)
 
     def predict(self, text, intents_schema):
         prompt = build_nlu_prompt(text, intents_schema)
+        self._record_call(prompt_tokens=count_tokens(prompt))
 
         try:
             # Set generation config
-            cnt_config = genai.GenerationConfig(
+            cnt_config = self._genai.GenerationConfig(
                 temperature=self.temperature
             )
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=cnt_config
+            # Paced by the quota limiter; 429s are retried with jittered back-off
+            response = call_with_retry(
+                lambda: self.model.generate_content(prompt, generation_config=cnt_config),
+                self.rate_limiter,
+                max_retries=self.max_retries,
             )
             
             raw_output = response.text
-            return self._safe_parse(raw_output)
+            result = self._safe_parse(raw_output)
+
+            # Prefer the API's own token accounting over local estimates
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None and getattr(usage, "prompt_token_count", 0):
+                self._record_call(
+                    prompt_tokens=usage.prompt_token_count,
+                    output_tokens=getattr(usage, "candidates_token_count", 0),
+                )
+            return result
 
         except Exception as e:
-            # Graceful handling for Quota Exceeded or other API errors
+            self._record_call(parse_outcome="error")
+            # Graceful handling for Quota Exceeded (after retries) or other API errors
             return {
                 "intent": "unknown",
                 "confidence": 0.0,
@@ -41,13 +78,23 @@ class GeminiNLU(BaseNLUModel):
                 "error": f"Gemini error: {str(e)}"
             }
 
+    def predict_many(self, texts: List[str], intents_schema: dict) -> List[dict]:
+        """
+        Predict several texts concurrently, up to max_concurrency requests in flight.
+        Results are returned in input order.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            return list(pool.map(lambda text: self.predict(text, intents_schema), texts))
+
     def _safe_parse(self, raw_output: str) -> dict:
         # Extract JSON from potential markdown or extra text
         match = re.search(r"\{.*\}", raw_output, re.DOTALL)
+        self._record_call(output_tokens=count_tokens(raw_output))
 
         if not match:
             # If no JSON object found, treat the whole raw output as a response if it's text
             if raw_output and len(raw_output.strip()) > 5:
+                 self._record_call(parse_outcome="raw_text")
                  return {
                     "intent": "general_conversation",
                     "confidence": 0.5,
@@ -60,7 +107,9 @@ class GeminiNLU(BaseNLUModel):
             # Clean up potential markdown JSON markers if the match included them
             json_str = match.group()
             parsed = json.loads(json_str)
-            return self._normalize(parsed)
+            result = self._normalize(parsed)
+            self._record_call(parse_outcome="json")
+            return result
         except Exception:
             return self._fallback()
 
@@ -73,6 +122,7 @@ class GeminiNLU(BaseNLUModel):
         }
 
     def _fallback(self):
+        self._record_call(parse_outcome="fallback")
         return {
             "intent": "unknown",
             "confidence": 0.0,
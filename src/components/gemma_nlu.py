@@ -2,17 +2,48 @@
 import json
 import subprocess
 import re
+from typing import Dict, Optional
 from src.components.llm_base import BaseNLUModel
-from src.utils.prompt_template import build_nlu_prompt
+from src.utils import ollama_client
+from src.utils.prompt_template import PROMPT_VARIANTS
+from src.utils.token_counter import count_tokens
 
 
 class GemmaNLU(BaseNLUModel):
 
-    def __init__(self, model_name: str):
+    def __init__(self, model_name: str, options: Optional[Dict] = None, prompt_variant: str = "full"):
+        """
+        Args:
+            model_name (str): Ollama model tag
+            options (Dict): Ollama generation options (temperature, num_predict, ...)
+            prompt_variant (str): Key of PROMPT_VARIANTS used to build the prompt
+        """
         super().__init__(model_name)
+        if prompt_variant not in PROMPT_VARIANTS:
+            raise ValueError(f"Unknown prompt variant '{prompt_variant}'; choose from {list(PROMPT_VARIANTS)}")
+        self.options = options or {}
+        self.prompt_variant = prompt_variant
+        self.build_prompt = PROMPT_VARIANTS[prompt_variant]
+
+    @property
+    def cache_version(self) -> str:
+        # Settings that change the output, so a retuned config does not reuse old predictions
+        return json.dumps({"options": self.options, "prompt_variant": self.prompt_variant}, sort_keys=True)
 
     def predict(self, text, intents_schema):
-        prompt = build_nlu_prompt(text, intents_schema)
+        prompt = self.build_prompt(text, intents_schema)
+        self._record_call(prompt_tokens=count_tokens(prompt))
+        output = self.generate(prompt)
+
+        return self._safe_parse(output)
+
+    def generate(self, prompt: str) -> str:
+        """
+        Run a raw prompt through Ollama and return the decoded output
+        """
+        if self.options:
+            # `ollama run` takes no generation options, so use the HTTP API
+            return ollama_client.generate(self.model_name, prompt, options=self.options).get("response", "")
 
         process = subprocess.Popen(
             ["ollama", "run", self.model_name],
@@ -25,9 +56,7 @@ class GemmaNLU(BaseNLUModel):
         prompt_bytes = prompt.encode('utf-8')
         stdout_data, stderr_data = process.communicate(input=prompt_bytes)
         
-        output = stdout_data.decode('utf-8', errors='replace')
-
-        return self._safe_parse(output)
+        return stdout_data.decode('utf-8', errors='replace')
 
     def _safe_parse(self, raw_output: str) -> dict:
         """
@@ -35,10 +64,12 @@ class GemmaNLU(BaseNLUModel):
         """
         # Extract JSON from potential markdown or extra text
         match = re.search(r"\{.*\}", raw_output, re.DOTALL)
+        self._record_call(output_tokens=count_tokens(raw_output))
 
         if not match:
             # If no JSON object found, treat the whole raw output as a response if it's text
             if raw_output and len(raw_output.strip()) > 5:
+                 self._record_call(parse_outcome="raw_text")
                  return {
                     "intent": "general_conversation",
                     "confidence": 0.5,
@@ -51,7 +82,9 @@ class GemmaNLU(BaseNLUModel):
             # Clean up potential markdown JSON markers if the match included them
             json_str = match.group()
             parsed = json.loads(json_str)
-            return self._normalize(parsed)
+            result = self._normalize(parsed)
+            self._record_call(parse_outcome="json")
+            return result
         except Exception:
             return self._fallback()
 
@@ -64,6 +97,7 @@ class GemmaNLU(BaseNLUModel):
         }
 
     def _fallback(self):
+        self._record_call(parse_outcome="fallback")
         return {
             "intent": "unknown",
             "confidence": 0.0,
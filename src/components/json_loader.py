@@ -11,6 +11,12 @@ def load_intents(json_path: str) -> dict:
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
+    validate_intents(data)
+
+    return data
+
+
+def validate_intents(data: dict):
     if "intents" not in data:
         raise ValueError("Invalid schema: 'intents' key missing")
 
@@ -19,5 +25,3 @@ def load_intents(json_path: str) -> dict:
             raise ValueError("Each intent must have a 'name'")
         if "examples" not in intent or len(intent["examples"]) < 1:
             raise ValueError(f"Intent '{intent['name']}' has no examples")
-
-    return data
\ No newline at end of file
@@ -1,27 +1,40 @@
-import pandas as pd
-from json_loader import load_intents
+import json
+
+import pyarrow as pa
+from src.components.dataset import detect_format
+from src.components.json_loader import load_intents
 
 
 def generate_csv(
     json_path="data/raw_data/intents.json",
     output_csv="data/raw_data/full_nlu_dataset_325.csv"
 ):
+    """Flatten intents.json into a (text, intent) dataset; the format follows the file suffix."""
     data = load_intents(json_path)
 
-    rows = []
+    texts, labels = [], []
     for intent in data["intents"]:
         for example in intent["examples"]:
-            rows.append({
-                "text": example,
-                "intent": intent["name"]
-            })
+            texts.append(example)
+            labels.append(intent["name"])
+
+    table = pa.table({"text": texts, "intent": labels})
+    fmt = detect_format(output_csv)
 
-    df = pd.DataFrame(rows)
-    df.to_csv(output_csv, index=False, encoding="utf-8")
+    if fmt == "csv":
+        import pyarrow.csv as pacsv
+        pacsv.write_csv(table, output_csv)
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, output_csv)
+    else:
+        with open(output_csv, "w", encoding="utf-8") as f:
+            for row in table.to_pylist():
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
 
-    print("CSV generated successfully")
-    print(f"Total samples: {len(df)}")
+    print("Dataset generated successfully")
+    print(f"Total samples: {table.num_rows}")
 
 
 if __name__ == "__main__":
-    generate_csv()
\ No newline at end of file
+    generate_csv()
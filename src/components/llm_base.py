@@ -1,5 +1,8 @@
 # src/components/llm_base.py
+import threading
+import time
 from abc import ABC, abstractmethod
+from typing import Dict, Tuple
 
 class BaseNLUModel(ABC):
     """
@@ -8,6 +11,8 @@ class BaseNLUModel(ABC):
 
     def __init__(self, model_name: str):
         self.model_name = model_name
+        # Per-thread accounting of the current predict() call
+        self._call_stats = threading.local()
 
     @abstractmethod
     def predict(self, text: str, intents_schema: dict) -> dict:
@@ -21,3 +26,40 @@ class BaseNLUModel(ABC):
         }
         """
         pass
+
+    @property
+    def cache_version(self) -> str:
+        """
+        Anything besides the model name that changes predictions (weights,
+        generation settings), for prediction cache keys. Empty by default.
+        """
+        return ""
+
+    def predict_with_stats(self, text: str, intents_schema: dict) -> Tuple[dict, Dict]:
+        """
+        Run predict() and return its result together with call statistics:
+        latency (seconds), prompt_tokens, output_tokens and parse_outcome
+        ("json", "raw_text", "fallback" or "error").
+        """
+        self._call_stats.values = {}
+        start = time.perf_counter()
+        result = self.predict(text, intents_schema)
+        latency = time.perf_counter() - start
+
+        stats = {
+            "latency": latency,
+            "prompt_tokens": 0,
+            "output_tokens": 0,
+            "parse_outcome": "error" if isinstance(result, dict) and "error" in result else "json",
+        }
+        stats.update(self._call_stats.values)
+        return result, stats
+
+    def _record_call(self, **values):
+        """
+        Called by backends during predict() to report token counts and parse outcome.
+        """
+        current = getattr(self._call_stats, "values", None)
+        if current is None:
+            current = self._call_stats.values = {}
+        current.update(values)
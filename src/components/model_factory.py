@@ -0,0 +1,78 @@
+# src/components/model_factory.py
+from pathlib import Path
+from typing import Optional, Tuple
+from src.components.distilled_nlu import DistilledNLU
+from src.components.gemma_nlu import GemmaNLU
+from src.components.llm_base import BaseNLUModel
+from src.components.qwen_nlu import QwenNLU
+
+
+def resolve_distilled_path(model_name: Optional[str], default_path: str) -> str:
+    """
+    Model path for a requested distilled model name. Names come from API
+    requests and joblib files are unpickled, so only files inside the
+    configured model's directory are accepted.
+
+    Raises:
+        ValueError: For a path outside that directory
+    """
+    if not model_name:
+        return default_path
+    models_dir = Path(default_path).resolve().parent
+    candidate = Path(model_name)
+    # A bare file name refers to the models directory
+    resolved = (models_dir / candidate if candidate.name == model_name else candidate).resolve()
+    if resolved.parent != models_dir:
+        raise ValueError(f"Distilled model '{model_name}' must be a file in {models_dir}")
+    return str(Path(default_path).parent / resolved.name)
+
+
+def ollama_settings(section: dict) -> dict:
+    """
+    GemmaNLU/QwenNLU keyword arguments from an `ollama`/`qwen` config section.
+    """
+    options = {key: section[key] for key in ("temperature", "num_predict") if section.get(key) is not None}
+    return {"options": options, "prompt_variant": section.get("prompt_variant", "full")}
+
+
+def create_model(
+    model_type: Optional[str],
+    config: dict,
+    model_name: Optional[str] = None,
+    api_key: Optional[str] = None,
+    temperature: float = 0.3,
+) -> Tuple[BaseNLUModel, str]:
+    """
+    Build an NLU backend from config.yaml settings.
+
+    Returns:
+        Tuple[BaseNLUModel, str]: The model and the resolved model name
+
+    Raises:
+        ValueError: For an unknown model type, or a distilled model outside the models directory
+    """
+    # Default to gemma if not specified
+    if not model_type:
+        model_type = config.get("llm", {}).get("default_model", "gemma")
+
+    if model_type == "gemma":
+        ollama_config = config.get("ollama", {})
+        actual_model_name = model_name or ollama_config.get("model_name", "gemma")
+        model = GemmaNLU(actual_model_name, **ollama_settings(ollama_config))
+    elif model_type == "qwen":
+        qwen_config = config.get("qwen", {})
+        actual_model_name = model_name or qwen_config.get("model_name", "qwen2.5:3b")
+        # Qwen via Ollama doesn't need API key
+        model = QwenNLU(actual_model_name, **ollama_settings(qwen_config))
+    elif model_type == "distilled":
+        # Local classifier; uncertain queries fall back to the default LLM
+        distilled_config = config.get("distilled", {})
+        actual_model_name = resolve_distilled_path(model_name, distilled_config.get("model_path", "models/distilled_intent.joblib"))
+        fallback = None
+        if distilled_config.get("fallback_to_llm", True):
+            fallback, _ = create_model(config.get("llm", {}).get("default_model", "gemma"), config)
+        model = DistilledNLU(actual_model_name, fallback_model=fallback, min_confidence=distilled_config.get("min_confidence", 0.7))
+    else:
+        raise ValueError(f"Unknown model type '{model_type}'")
+
+    return model, actual_model_name
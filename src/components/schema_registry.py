@@ -0,0 +1,153 @@
+"""
+Schema Registry
+---------------
+Keeps the intent schema (intents.json) in memory together with
+precomputed lookup indices, and reloads it when the file changes.
+
+Every loaded schema is an immutable snapshot identified by a content
+hash. Anything derived from the schema (prompt pieces, classifiers,
+caches) is either memoized on the snapshot via `derive` or keyed by
+`version`, so it is rebuilt automatically after a reload.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.components.json_loader import validate_intents
+
+
+class SchemaSnapshot:
+    """
+    Immutable view of one version of the intent schema.
+    """
+
+    def __init__(self, data: dict, version: str, path: str):
+        self.data = data
+        self.version = version
+        self.path = path
+        self.loaded_at = time.time()
+
+        self.intent_names: List[str] = [intent["name"] for intent in data["intents"]]
+        self.intents_by_name: Dict[str, dict] = {intent["name"]: intent for intent in data["intents"]}
+        self.examples: Dict[str, List[str]] = {
+            intent["name"]: list(intent.get("examples", [])) for intent in data["intents"]
+        }
+        self.entity_types: Dict[str, List[str]] = data.get("entities", {})
+
+        entity_to_intents: Dict[str, List[str]] = {name: [] for name in self.entity_types}
+        for intent in data["intents"]:
+            for entity in intent.get("entities", []):
+                entity_to_intents.setdefault(entity, []).append(intent["name"])
+        self.entity_to_intents = entity_to_intents
+
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    def get_intent(self, name: str) -> Optional[dict]:
+        return self.intents_by_name.get(name)
+
+    def derive(self, key: str, factory: Callable[["SchemaSnapshot"], Any]) -> Any:
+        """
+        Return a value computed from this schema version, building it once.
+        """
+        if key in self._derived:
+            return self._derived[key]
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = factory(self)
+            return self._derived[key]
+
+
+class SchemaRegistry:
+    """
+    Watches an intents.json file and serves the latest valid snapshot.
+
+    The file is checked at most once every `poll_interval` seconds (by
+    mtime and size) on access, so reads stay cheap. An invalid edit keeps
+    the previous snapshot in service.
+    """
+
+    def __init__(self, json_path: str, poll_interval: float = 2.0):
+        self.json_path = json_path
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[SchemaSnapshot] = None
+        self._file_stamp = None
+        self._last_check = 0.0
+        self._listeners: List[Callable[[SchemaSnapshot], None]] = []
+        self.last_error: Optional[str] = None
+
+        self.reload(force=True)
+
+    @property
+    def version(self) -> str:
+        return self.current().version
+
+    def current(self) -> SchemaSnapshot:
+        """
+        Return the active snapshot, reloading first if the file changed.
+        """
+        now = time.monotonic()
+        if now - self._last_check >= self.poll_interval:
+            self._last_check = now
+            self.reload()
+        return self._snapshot
+
+    def subscribe(self, callback: Callable[[SchemaSnapshot], None]):
+        """
+        Register a callback invoked with the new snapshot after each version change.
+        """
+        self._listeners.append(callback)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload the schema if the file changed.
+
+        Returns:
+            bool: True if a new version was activated
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.json_path)
+            except FileNotFoundError:
+                if self._snapshot is None:
+                    raise FileNotFoundError(f"File not found: {self.json_path}")
+                self.last_error = f"File not found: {self.json_path}"
+                return False
+
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if not force and stamp == self._file_stamp:
+                return False
+
+            with open(self.json_path, "rb") as f:
+                raw = f.read()
+            version = hashlib.sha256(raw).hexdigest()[:16]
+            self._file_stamp = stamp
+
+            if self._snapshot is not None and version == self._snapshot.version:
+                return False
+
+            try:
+                data = json.loads(raw.decode("utf-8"))
+                validate_intents(data)
+            except ValueError as e:
+                if self._snapshot is None:
+                    raise
+                self.last_error = str(e)
+                print(f"Schema reload failed, keeping version {self._snapshot.version}: {e}")
+                return False
+
+            snapshot = SchemaSnapshot(data, version, self.json_path)
+            self._snapshot = snapshot
+            self.last_error = None
+
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Schema listener failed: {e}")
+        return True
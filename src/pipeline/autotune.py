@@ -0,0 +1,258 @@
+"""
+Model Autotuner
+---------------
+Grid search over local Ollama settings to find the accuracy/latency
+trade-off for our intents.
+
+Every configuration (model, temperature, prompt variant, output-token cap)
+classifies the same stratified sample, one request at a time so latencies
+are comparable. For each configuration we measure accuracy, p50/p95
+latency and prompt + output tokens per query (a failed call counts with
+its full duration), keep the Pareto-optimal ones among configurations
+within the error-rate limit (no other configuration is at least as
+accurate, as fast at p95 and as cheap in tokens while better on one of
+them), and print a recommended config.yaml snippet. The serving backends
+read every tuned setting from that snippet. With --max-p95 nothing is
+recommended when no configuration meets the budget.
+
+Usage:
+    python -m src.pipeline.autotune --models gemma3,qwen2.5:3b --temperatures 0,0.3 --num-predict 128,256
+    python -m src.pipeline.autotune --dataset data/raw_data/full_nlu_dataset_325.csv --max-p95 2.0
+"""
+
+import argparse
+import itertools
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.components.dataset import stratified_sample
+from src.components.eval_runs import select_samples
+from src.components.evaluator import Evaluator, percentile
+from src.components.gemma_nlu import GemmaNLU
+from src.components.json_loader import load_intents
+from src.utils import ollama_client
+from src.utils.config import load_config
+from src.utils.prompt_template import PROMPT_VARIANTS
+
+REPORTS_DIR = Path("logs/autotune")
+
+
+def _parse_list(value: str, cast=str) -> List:
+    return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def evaluate_config(
+    config: Dict,
+    samples: List[Tuple[str, str]],
+    intents_data: dict,
+    host: Optional[str] = None,
+) -> Dict:
+    """
+    Run one configuration over the samples and summarize quality and cost.
+    """
+    build_prompt = PROMPT_VARIANTS[config["prompt_variant"]]
+    # Any Ollama model returns the same JSON contract, so GemmaNLU's parser applies
+    parser = GemmaNLU(config["model"])
+    options = {"temperature": config["temperature"], "num_predict": config["num_predict"]}
+
+    # Untimed call so model load time is not counted against the first sample
+    ollama_client.generate(config["model"], build_prompt(samples[0][0], intents_data), options=options, host=host)
+
+    y_true, y_pred, latencies, tokens, errors = [], [], [], [], 0
+    for text, intent in samples:
+        start = time.perf_counter()
+        try:
+            response = ollama_client.generate(config["model"], build_prompt(text, intents_data), options=options, host=host)
+        except Exception:
+            # A failed call still cost its full duration (e.g. the timeout)
+            latencies.append(time.perf_counter() - start)
+            errors += 1
+            y_true.append(intent)
+            y_pred.append("unknown")
+            continue
+        latencies.append(time.perf_counter() - start)
+        tokens.append(response.get("prompt_eval_count", 0) + response.get("eval_count", 0))
+        y_true.append(intent)
+        y_pred.append(parser._safe_parse(response.get("response", "")).get("intent", "unknown"))
+
+    metrics = Evaluator().evaluate(y_true, y_pred)
+    return dict(
+        config,
+        accuracy=metrics["accuracy"],
+        f1_score=metrics["f1_score"],
+        latency_p50=percentile(latencies, 50),
+        latency_p95=percentile(latencies, 95),
+        tokens_per_query=sum(tokens) / len(tokens) if tokens else 0.0,
+        errors=errors,
+        error_rate=errors / len(samples),
+    )
+
+
+def pareto_front(results: List[Dict]) -> List[Dict]:
+    """
+    Keep results not dominated on (accuracy up, latency_p95 down, tokens_per_query down).
+    """
+
+    def dominates(a: Dict, b: Dict) -> bool:
+        at_least = (
+            a["accuracy"] >= b["accuracy"]
+            and a["latency_p95"] <= b["latency_p95"]
+            and a["tokens_per_query"] <= b["tokens_per_query"]
+        )
+        better = (
+            a["accuracy"] > b["accuracy"]
+            or a["latency_p95"] < b["latency_p95"]
+            or a["tokens_per_query"] < b["tokens_per_query"]
+        )
+        return at_least and better
+
+    front = [r for r in results if not any(dominates(other, r) for other in results)]
+    return sorted(front, key=lambda r: (-r["accuracy"], r["latency_p95"]))
+
+
+def recommend(front: List[Dict], max_p95: Optional[float] = None) -> Optional[Dict]:
+    """
+    Most accurate Pareto configuration within the latency budget (fastest on ties),
+    or None when no configuration meets the budget.
+    """
+    candidates = [r for r in front if max_p95 is None or r["latency_p95"] <= max_p95]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda r: (-r["accuracy"], r["latency_p95"], r["tokens_per_query"]))
+
+
+def config_snippet(result: Dict) -> str:
+    """
+    config.yaml lines for the recommended configuration.
+    """
+    section, model_type = ("qwen", "qwen") if result["model"].startswith("qwen") else ("ollama", "gemma")
+    return "\n".join([
+        f"# autotune: accuracy {result['accuracy']:.2%}, p95 {result['latency_p95']:.2f}s, "
+        f"{result['tokens_per_query']:.0f} tokens/query",
+        "llm:",
+        f"  default_model: {model_type}",
+        "",
+        f"{section}:",
+        f"  model_name: {result['model']}",
+        f"  temperature: {result['temperature']}",
+        f"  num_predict: {result['num_predict']}",
+        f"  prompt_variant: {result['prompt_variant']}",
+    ])
+
+
+def run(
+    models: List[str],
+    temperatures: List[float],
+    prompt_variants: List[str],
+    num_predict: List[int],
+    samples_per_intent: int = 5,
+    seed: int = 42,
+    dataset_path: Optional[str] = None,
+    intents_path: str = "data/raw_data/intents.json",
+    max_p95: Optional[float] = None,
+    max_error_rate: float = 0.05,
+    host: Optional[str] = None,
+) -> Dict:
+    unknown = [v for v in prompt_variants if v not in PROMPT_VARIANTS]
+    if unknown:
+        raise ValueError(f"Unknown prompt variant(s) {unknown}; choose from {list(PROMPT_VARIANTS)}")
+
+    intents_data = load_intents(intents_path)
+    if dataset_path:
+        samples = stratified_sample(dataset_path, samples_per_intent, seed)
+    else:
+        samples = select_samples(intents_data, samples_per_intent, seed)
+    if not samples:
+        raise ValueError("No samples selected")
+
+    grid = list(itertools.product(models, temperatures, prompt_variants, num_predict))
+    print(f"Autotuning {len(grid)} configurations on {len(samples)} samples")
+
+    results = []
+    for model, temperature, variant, tokens in grid:
+        config = {"model": model, "temperature": temperature, "prompt_variant": variant, "num_predict": tokens}
+        try:
+            result = evaluate_config(config, samples, intents_data, host)
+        except Exception as e:
+            print(f"  {model} t={temperature} {variant} n={tokens}: skipped ({e})")
+            continue
+        results.append(result)
+        print(f"  {model} t={temperature} {variant} n={tokens}: accuracy {result['accuracy']:.2%} | "
+              f"p50 {result['latency_p50']:.2f}s | p95 {result['latency_p95']:.2f}s | "
+              f"{result['tokens_per_query']:.0f} tokens/query | errors {result['errors']}")
+
+    # Unreliable configurations are reported but never recommended
+    eligible = [r for r in results if r["error_rate"] <= max_error_rate]
+    excluded = len(results) - len(eligible)
+    if excluded:
+        print(f"Excluded {excluded} configuration(s) with error rate above {max_error_rate:.0%} from the Pareto front")
+    front = pareto_front(eligible)
+    best = recommend(front, max_p95)
+    if best is None and front:
+        print(f"No Pareto configuration has p95 within {max_p95}s; nothing recommended")
+    return {
+        "created_at": datetime.now().isoformat(),
+        "seed": seed,
+        "samples": len(samples),
+        "dataset_path": dataset_path,
+        "results": results,
+        "pareto_front": front,
+        "recommended": best,
+        "config_snippet": config_snippet(best) if best else None,
+    }
+
+
+def main():
+    config = load_config()
+    default_models = [config.get("ollama", {}).get("model_name", "gemma3"), config.get("qwen", {}).get("model_name", "qwen2.5:3b")]
+
+    parser = argparse.ArgumentParser(description="Find Pareto-optimal local model settings")
+    parser.add_argument("--models", default=",".join(default_models), help="Comma-separated Ollama model tags")
+    parser.add_argument("--temperatures", default="0.0,0.3")
+    parser.add_argument("--prompt-variants", default=",".join(PROMPT_VARIANTS))
+    parser.add_argument("--num-predict", default="128,256", help="Output-token caps")
+    parser.add_argument("--samples-per-intent", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dataset", default=None, help="Labelled CSV/JSONL/Parquet to sample instead of intents.json")
+    parser.add_argument("--intents", default="data/raw_data/intents.json")
+    parser.add_argument("--max-p95", type=float, default=None, help="Latency budget (seconds) for the recommendation")
+    parser.add_argument("--max-error-rate", type=float, default=0.05,
+                        help="Configurations with more failed calls than this are left off the Pareto front")
+    parser.add_argument("--host", default=None, help="Ollama base URL")
+    parser.add_argument("--output", default=None, help="Report path (default logs/autotune/<timestamp>.json)")
+    args = parser.parse_args()
+
+    report = run(
+        _parse_list(args.models),
+        _parse_list(args.temperatures, float),
+        _parse_list(args.prompt_variants),
+        _parse_list(args.num_predict, int),
+        samples_per_intent=args.samples_per_intent,
+        seed=args.seed,
+        dataset_path=args.dataset,
+        intents_path=args.intents,
+        max_p95=args.max_p95,
+        max_error_rate=args.max_error_rate,
+        host=args.host,
+    )
+
+    output = Path(args.output) if args.output else REPORTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nPareto front:")
+    for r in report["pareto_front"]:
+        print(f"  {r['model']} t={r['temperature']} {r['prompt_variant']} n={r['num_predict']}: "
+              f"accuracy {r['accuracy']:.2%} | p95 {r['latency_p95']:.2f}s | {r['tokens_per_query']:.0f} tokens/query")
+    if report["config_snippet"]:
+        print("\nRecommended config.yaml settings:\n")
+        print(report["config_snippet"])
+    print("\nReport saved to", output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Bulk Classification
+-------------------
+Offline pipeline that streams a large CSV/JSONL/Parquet file of messages
+through an NLU backend and writes intents, entities and confidence in
+chunks.
+
+- Input is read in pyarrow record batches, never fully in memory.
+- Predictions run with bounded concurrency and go through the shared
+  prediction cache (the same one /analyze uses), plus an in-run cache for
+  repeated messages.
+- Each chunk is committed before the checkpoint advances, so a restarted
+  job resumes after the last committed row without duplicating output.
+
+Output:
+    *.jsonl   one JSON object per row, appended chunk by chunk
+    other     a directory of Parquet part files (part-00000.parquet, ...)
+
+Usage:
+    python -m src.pipeline.bulk_classify archive.jsonl out.parquet --model-type gemma --concurrency 8
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+
+from src.components.dataset import iter_samples
+from src.components.entity_validator import validate_result
+from src.components.model_factory import create_model
+from src.components.schema_registry import SchemaRegistry
+from src.utils.config import load_config
+from src.utils.shared_store import SharedStore, prediction_cache_key
+
+# Fixed so every Parquet part has the same schema, whether or not its chunk had errors
+OUTPUT_SCHEMA = pa.schema([
+    ("row_id", pa.int64()),
+    ("text", pa.string()),
+    ("intent", pa.string()),
+    ("confidence", pa.float64()),
+    ("entities", pa.string()),
+    ("error", pa.string()),
+])
+
+
+class Checkpoint:
+    """
+    Progress marker stored next to the output: rows committed, parts written
+    and (for JSONL) the committed byte size of the output file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.state = {"rows_done": 0, "parts": 0, "bytes": 0}
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                self.state.update(json.load(f))
+
+    def save(self, **updates):
+        self.state.update(updates)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+
+class ChunkWriter:
+    """
+    Commits result chunks to JSONL or Parquet parts.
+    """
+
+    def __init__(self, output: Path, checkpoint: Checkpoint):
+        self.output = output
+        self.checkpoint = checkpoint
+        self.format = "jsonl" if output.suffix.lower() in (".jsonl", ".ndjson") else "parquet"
+
+        if self.format == "jsonl":
+            output.parent.mkdir(parents=True, exist_ok=True)
+            # Drop anything written after the last checkpoint (crash mid-chunk)
+            if output.exists() and output.stat().st_size > checkpoint.state["bytes"]:
+                with open(output, "r+b") as f:
+                    f.truncate(checkpoint.state["bytes"])
+        else:
+            output.mkdir(parents=True, exist_ok=True)
+
+    def write(self, rows: List[Dict]):
+        if self.format == "jsonl":
+            with open(self.output, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.checkpoint.save(
+                rows_done=self.checkpoint.state["rows_done"] + len(rows),
+                bytes=self.output.stat().st_size,
+            )
+        else:
+            import pyarrow.parquet as pq
+
+            part = self.checkpoint.state["parts"]
+            table = pa.Table.from_pylist(
+                [dict(row, entities=json.dumps(row["entities"], ensure_ascii=False)) for row in rows],
+                schema=OUTPUT_SCHEMA,
+            )
+            part_path = self.output / f"part-{part:05d}.parquet"
+            tmp_path = self.output / f".part-{part:05d}.parquet.tmp"
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, part_path)
+            self.checkpoint.save(rows_done=self.checkpoint.state["rows_done"] + len(rows), parts=part + 1)
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def iter_chunks(path: str, chunk_size: int, skip: int) -> Iterator[List[Tuple[int, str]]]:
+    """Yield (row_id, text) chunks, skipping rows already committed."""
+    chunk = []
+    for row_id, (text, _) in enumerate(iter_samples(path, labelled=False)):
+        if row_id < skip:
+            continue
+        chunk.append((row_id, text))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(
+    input_path: str,
+    output_path: str,
+    model_type: Optional[str] = None,
+    model_name: Optional[str] = None,
+    concurrency: int = 4,
+    chunk_size: int = 1000,
+    use_cache: bool = True,
+    config_path: str = "config/config.yaml",
+    intents_path: str = "data/raw_data/intents.json",
+) -> Dict:
+    config = load_config(config_path)
+    model, resolved_name = create_model(model_type, config, model_name)
+    schema = SchemaRegistry(intents_path).current()
+    store = SharedStore(config.get("server", {}).get("shared_store_path", "logs/shared_state.db")) if use_cache else None
+    cache_ttl = config.get("cache", {}).get("prediction_ttl", 3600)
+
+    output = Path(output_path)
+    checkpoint = Checkpoint(output.parent / f"{output.name}.checkpoint.json")
+    writer = ChunkWriter(output, checkpoint)
+    skip = checkpoint.state["rows_done"]
+    if skip:
+        print(f"Resuming after {skip} committed rows")
+
+    run_cache: Dict[str, Dict] = {}
+    counters = {"rows": 0, "cache_hits": 0, "errors": 0}
+    counters_lock = threading.Lock()
+
+    def count(name: str):
+        with counters_lock:
+            counters[name] += 1
+
+    def classify(item: Tuple[int, str]) -> Dict:
+        row_id, text = item
+        try:
+            key = prediction_cache_key(resolved_name, 0.3, schema.version, text, model.cache_version)
+            result = run_cache.get(key) or (store.get("predictions", key) if store else None)
+            fresh = result is None
+            if fresh:
+                try:
+                    result = model.predict(text, schema.data)
+                except Exception as e:
+                    result = {"intent": "unknown", "confidence": 0.0, "entities": {}, "error": str(e)}
+            else:
+                count("cache_hits")
+            # Copy so a cached prediction is not modified; validated before caching, like /analyze
+            result = validate_result(dict(result), schema)
+            if fresh and "error" not in result:
+                run_cache[key] = result
+                if store:
+                    store.set("predictions", key, result, ttl=cache_ttl)
+            row = {
+                "row_id": row_id,
+                "text": str(text),
+                "intent": result["intent"],
+                "confidence": _as_float(result.get("confidence")),
+                "entities": result["entities"],
+                "error": str(result["error"]) if result.get("error") is not None else None,
+            }
+        except Exception as e:
+            # One malformed prediction becomes an error row instead of failing the chunk
+            row = {"row_id": row_id, "text": str(text), "intent": "unknown", "confidence": 0.0,
+                   "entities": {}, "error": f"{type(e).__name__}: {e}"}
+        if row["error"] is not None:
+            count("errors")
+        return row
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for chunk in iter_chunks(input_path, chunk_size, skip):
+            rows = list(pool.map(classify, chunk))
+            writer.write(rows)
+            counters["rows"] += len(rows)
+            # Keep the in-run cache bounded
+            if len(run_cache) > 100_000:
+                run_cache.clear()
+
+            elapsed = time.perf_counter() - start
+            print(f"{checkpoint.state['rows_done']} rows committed | {counters['rows'] / elapsed:.1f} rows/s | "
+                  f"cache hits {counters['cache_hits']} | errors {counters['errors']}")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows_processed": counters["rows"],
+        "rows_total": checkpoint.state["rows_done"],
+        "cache_hits": counters["cache_hits"],
+        "errors": counters["errors"],
+        "seconds": elapsed,
+        "rows_per_sec": counters["rows"] / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify a large message file in resumable chunks")
+    parser.add_argument("input", help="CSV, JSONL or Parquet file with a text/message column")
+    parser.add_argument("output", help="*.jsonl file, or a directory for Parquet parts")
+    parser.add_argument("--model-type", default=None, help="gemma, qwen or distilled (default from config)")
+    parser.add_argument("--model-name", default=None)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--no-cache", action="store_true", help="Skip the shared prediction cache")
+    parser.add_argument("--config", default="config/config.yaml")
+    parser.add_argument("--intents", default="data/raw_data/intents.json")
+    args = parser.parse_args()
+
+    summary = run(
+        args.input,
+        args.output,
+        model_type=args.model_type,
+        model_name=args.model_name,
+        concurrency=args.concurrency,
+        chunk_size=args.chunk_size,
+        use_cache=not args.no_cache,
+        config_path=args.config,
+        intents_path=args.intents,
+    )
+    print(f"Done: {summary['rows_processed']} rows in {summary['seconds']:.1f}s "
+          f"({summary['rows_per_sec']:.1f} rows/s), {summary['cache_hits']} cache hits, {summary['errors']} errors")
+
+
+if __name__ == "__main__":
+    main()
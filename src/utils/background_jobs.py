@@ -0,0 +1,92 @@
+"""
+Background Jobs
+---------------
+Runs many independent predictions concurrently off the caller's thread
+and exposes partial results while they complete. Jobs are keyed by
+their inputs, so asking for the same work again returns the existing
+(running or finished) job instead of recomputing it.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class BackgroundJob:
+    """
+    A set of items processed concurrently by a worker function.
+    """
+
+    def __init__(self, key: Hashable, items: List[Any], worker: Callable[[Any], Dict], max_workers: int = 4):
+        self.key = key
+        self.items = items
+        self.total = len(items)
+        self.results: List[Optional[Dict]] = [None] * self.total
+        self.completed = 0
+        self.errors: List[str] = []
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._run, args=(worker, max_workers), daemon=True)
+        self._thread.start()
+
+    def _run(self, worker: Callable[[Any], Dict], max_workers: int):
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {pool.submit(worker, item): index for index, item in enumerate(self.items)}
+            for future in as_completed(futures):
+                index = futures[future]
+                with self._lock:
+                    try:
+                        self.results[index] = future.result()
+                    except Exception as e:
+                        self.errors.append(str(e))
+                    self.completed += 1
+        self.finished_at = time.time()
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def progress(self) -> float:
+        return self.completed / self.total if self.total else 1.0
+
+    def partial_results(self) -> List[Dict]:
+        """Finished results so far, in input order."""
+        with self._lock:
+            return [r for r in self.results if r is not None]
+
+
+class JobRegistry:
+    """
+    Keeps jobs by input key so identical requests reuse earlier work.
+    """
+
+    def __init__(self, max_jobs: int = 32):
+        self.max_jobs = max_jobs
+        self._jobs: Dict[Hashable, BackgroundJob] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[BackgroundJob]:
+        return self._jobs.get(key)
+
+    def submit(self, key: Hashable, items: List[Any], worker: Callable[[Any], Dict], max_workers: int = 4) -> BackgroundJob:
+        """
+        Start a job for key, or return the existing one for the same inputs.
+        Jobs that finished with errors are restarted.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (job.done and job.errors):
+                return job
+
+            job = BackgroundJob(key, items, worker, max_workers)
+            self._jobs[key] = job
+
+            # Drop the oldest finished jobs beyond the cap
+            finished = [k for k, j in self._jobs.items() if j.done]
+            while len(self._jobs) > self.max_jobs and finished:
+                self._jobs.pop(finished.pop(0))
+            return job
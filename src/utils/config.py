@@ -0,0 +1,9 @@
+def load_config(path: str = "config/config.yaml") -> dict:
+    """Read the YAML config; an absent file yields an empty config."""
+    import yaml
+
+    try:
+        with open(path, "r") as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return {}
@@ -0,0 +1,88 @@
+"""
+Import Profiler
+---------------
+Reports where process start-up time goes by running a fresh interpreter
+with `python -X importtime` and aggregating the import cost of each
+top-level package.
+
+Usage:
+    python -m src.utils.import_profiler server
+    python -m src.utils.import_profiler app --top 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+
+def profile_imports(module: str = "server") -> List[Dict]:
+    """
+    Import a module in a fresh interpreter and collect per-module import times.
+
+    Args:
+        module (str): Module to import, e.g. "server" or "app"
+
+    Returns:
+        List[Dict]: One entry per imported module with self and cumulative microseconds
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing '{module}' failed:\n{completed.stderr[-2000:]}")
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            # "import time:  <self> | <cumulative> | <indented module name>"
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            name = name.rstrip()[1:] if name.startswith(" ") else name.rstrip()
+            entries.append({
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_us": int(self_us.strip()),
+                "cumulative_us": int(cumulative_us.strip()),
+            })
+        except ValueError:
+            continue
+    return entries
+
+
+def summarize(entries: List[Dict], top: int = 15) -> List[Dict]:
+    """
+    Aggregate self import time by top-level package, slowest first.
+    """
+    totals: Dict[str, int] = {}
+    for entry in entries:
+        package = entry["module"].split(".")[0]
+        totals[package] = totals.get(package, 0) + entry["self_us"]
+
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return [{"package": name, "ms": round(us / 1000, 1)} for name, us in ranked[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile import time of a module")
+    parser.add_argument("module", nargs="?", default="server")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    entries = profile_imports(args.module)
+    total_ms = sum(e["self_us"] for e in entries) / 1000
+
+    print(f"Import profile for '{args.module}' (total {total_ms:.1f} ms)")
+    print(f"{'package':<30}{'ms':>10}{'share':>10}")
+    for row in summarize(entries, args.top):
+        share = row["ms"] / total_ms if total_ms else 0.0
+        print(f"{row['package']:<30}{row['ms']:>10.1f}{share:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
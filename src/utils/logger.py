@@ -1,4 +1,5 @@
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -30,8 +31,13 @@ def log_query(message: str, model_type: str, result: dict, model_name: Optional[
         "result": result
     }
 
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+    # One O_APPEND write per entry so lines from concurrent worker processes never interleave
+    line = (json.dumps(log_entry, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
 
 
 def read_logs(limit: int = 200):
@@ -0,0 +1,173 @@
+"""
+Long Input Compression
+----------------------
+Fits long messages and multi-speaker transcripts into a token budget.
+Transcripts are split by speaker turn; the most recent turns are kept
+verbatim while older turns are condensed, either extractively or with
+an optional summarizer that is run over chunks in parallel.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.token_counter import count_tokens, truncate_to_tokens
+
+# "A:", "User:", "Person 1:", "Me:" at the start of a line
+_SPEAKER_RE = re.compile(r"^[ \t]*([A-Za-z][\w .'-]{0,29}?)[ \t]*:[ \t]*", re.MULTILINE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+EARLIER_HEADER = "[Earlier conversation, condensed]"
+RECENT_HEADER = "[Recent conversation]"
+
+
+def split_turns(text: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Split a transcript into (speaker, utterance) turns.
+
+    Text without at least two speaker markers is split into paragraphs
+    with speaker None.
+    """
+    markers = list(_SPEAKER_RE.finditer(text))
+
+    if len(markers) < 2:
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+        return [(None, p) for p in paragraphs]
+
+    turns = []
+    preamble = text[:markers[0].start()].strip()
+    if preamble:
+        turns.append((None, preamble))
+
+    for i, match in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+        utterance = text[match.end():end].strip()
+        if utterance:
+            turns.append((match.group(1).strip(), utterance))
+
+    return turns
+
+
+def format_turn(speaker: Optional[str], utterance: str) -> str:
+    return f"{speaker}: {utterance}" if speaker else utterance
+
+
+def _extractive_summary(speaker: Optional[str], utterance: str, max_tokens: int) -> str:
+    """Keep the first sentence of a turn, cut to max_tokens."""
+    first_sentence = _SENTENCE_RE.split(utterance.strip(), maxsplit=1)[0]
+    condensed = truncate_to_tokens(first_sentence, max_tokens, keep="start")
+    if condensed != utterance.strip():
+        condensed = condensed.rstrip() + " ..."
+    return format_turn(speaker, condensed)
+
+
+def _chunk_turns(lines: List[str], chunk_tokens: int) -> List[str]:
+    """Group formatted turns into chunks of roughly chunk_tokens each."""
+    chunks, current, used = [], [], 0
+    for line in lines:
+        cost = count_tokens(line)
+        if current and used + cost > chunk_tokens:
+            chunks.append("\n".join(current))
+            current, used = [], 0
+        current.append(line)
+        used += cost
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def compress_long_input(
+    text: str,
+    max_tokens: int,
+    keep_recent_turns: int = 6,
+    summary_tokens_per_turn: int = 40,
+    chunk_tokens: int = 400,
+    summarizer: Optional[Callable[[str], str]] = None,
+    max_workers: int = 4,
+) -> Tuple[str, Dict]:
+    """
+    Compress text so that it fits within max_tokens.
+
+    Args:
+        text (str): Raw user message or transcript
+        max_tokens (int): Token budget for the message
+        keep_recent_turns (int): Number of latest turns kept verbatim when they fit
+        summary_tokens_per_turn (int): Extractive budget for each older turn
+        chunk_tokens (int): Size of the chunks handed to the summarizer
+        summarizer (Callable): Optional function condensing a chunk of turns
+        max_workers (int): Parallel summarizer calls
+
+    Returns:
+        Tuple[str, Dict]: Processed text and compression statistics
+    """
+    original_tokens = count_tokens(text)
+    info = {
+        "original_tokens": original_tokens,
+        "final_tokens": original_tokens,
+        "compressed": False,
+        "turns": 0,
+        "verbatim_turns": 0,
+    }
+
+    if original_tokens <= max_tokens:
+        return text, info
+
+    turns = split_turns(text)
+    info["turns"] = len(turns)
+    info["compressed"] = True
+
+    # Keep the latest turns verbatim, newest first, within ~70% of the budget
+    recent_budget = int(max_tokens * 0.7)
+    recent: List[str] = []
+    used = 0
+    for speaker, utterance in reversed(turns):
+        if len(recent) >= keep_recent_turns:
+            break
+        line = format_turn(speaker, utterance)
+        cost = count_tokens(line)
+        if used + cost > recent_budget:
+            if not recent:
+                # The latest turn alone is too long: keep its end, where the question usually is
+                recent.append(truncate_to_tokens(line, recent_budget, keep="end"))
+                used = count_tokens(recent[0])
+            break
+        recent.append(line)
+        used += cost
+    recent.reverse()
+    info["verbatim_turns"] = len(recent)
+
+    older = turns[:len(turns) - len(recent)]
+    condensed: List[str] = []
+
+    if older:
+        if summarizer is not None:
+            chunks = _chunk_turns([format_turn(s, u) for s, u in older], chunk_tokens)
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+                summaries = list(pool.map(summarizer, chunks))
+            condensed = [s.strip() for s in summaries if s and s.strip()]
+        else:
+            condensed = [_extractive_summary(s, u, summary_tokens_per_turn) for s, u in older]
+
+    # Drop the oldest condensed lines until everything fits
+    header_cost = count_tokens(EARLIER_HEADER) + count_tokens(RECENT_HEADER)
+    remaining = max_tokens - used - header_cost
+    kept: List[str] = []
+    for line in reversed(condensed):
+        cost = count_tokens(line)
+        if cost > remaining:
+            break
+        kept.append(line)
+        remaining -= cost
+    kept.reverse()
+
+    if kept:
+        processed = "\n".join([EARLIER_HEADER, *kept, RECENT_HEADER, *recent])
+    else:
+        processed = "\n".join(recent)
+
+    processed = truncate_to_tokens(processed, max_tokens, keep="end")
+    if not processed.strip():
+        # Never hand the model an empty message for non-empty input
+        processed = truncate_to_tokens(text.strip(), max(1, max_tokens), keep="end")
+    info["final_tokens"] = count_tokens(processed)
+    return processed, info
@@ -0,0 +1,65 @@
+"""
+Ollama HTTP Client
+------------------
+Minimal client for Ollama's /api/generate endpoint.
+
+Unlike `ollama run`, the HTTP API accepts generation options and returns
+the conversation `context` (token ids). Passing that context back on the
+next call lets Ollama reuse the cached prefix, so a follow-up turn only
+pays prompt evaluation for its own new tokens.
+"""
+
+import json
+import os
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+DEFAULT_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+
+
+def generate(
+    model: str,
+    prompt: str,
+    context: Optional[List[int]] = None,
+    options: Optional[Dict] = None,
+    host: Optional[str] = None,
+    timeout: float = 120.0,
+) -> Dict:
+    """
+    Run one non-streaming generation.
+
+    Args:
+        model (str): Ollama model tag, e.g. "gemma3"
+        prompt (str): Prompt text for this call only
+        context (List[int]): Context returned by the previous call, if any
+        options (Dict): Ollama options such as temperature or num_predict
+        host (str): Ollama base URL
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        Dict: Ollama response with "response", "context", "prompt_eval_count",
+            "eval_count" and duration fields (nanoseconds)
+    """
+    host = host or DEFAULT_HOST
+    if not host.startswith("http"):
+        host = f"http://{host}"
+
+    payload = {"model": model, "prompt": prompt, "stream": False}
+    if context:
+        payload["context"] = list(context)
+    if options:
+        payload["options"] = options
+
+    request = urllib.request.Request(
+        f"{host.rstrip('/')}/api/generate",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        detail = e.read().decode("utf-8", errors="replace")
+        raise RuntimeError(f"Ollama error {e.code}: {detail}") from e
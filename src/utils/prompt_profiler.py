@@ -0,0 +1,139 @@
+"""
+Prompt Profiler
+---------------
+Breaks the NLU prompt down by section (instructions, intent list, entity
+schema, output format, user query) into token and byte counts, and
+optionally measures what each section costs in prompt evaluation.
+
+Timing sends growing prefixes of the prompt (num_predict=1) and charges
+each section the difference in Ollama's prompt_eval_duration. Each
+request starts with a fresh nonce line so Ollama cannot reuse a cached
+prefix from the previous request. The stub backend instead charges a
+fixed cost per token, which is useful in CI without a model.
+
+With --check the profiler exits with status 1 when the prompt without
+the user query exceeds `prompt_budget.max_template_tokens`, so schema or
+template growth is caught before it slows every request.
+
+Usage:
+    python -m src.utils.prompt_profiler
+    python -m src.utils.prompt_profiler --backend ollama --model gemma3 --repeats 3
+    python -m src.utils.prompt_profiler --check
+"""
+
+import argparse
+import sys
+import uuid
+from typing import Dict, List, Optional
+
+from src.components.evaluator import percentile
+from src.components.json_loader import load_intents
+from src.utils import ollama_client
+from src.utils.config import load_config
+from src.utils.prompt_template import nlu_prompt_sections
+from src.utils.token_counter import count_tokens
+
+SAMPLE_QUERY = "I want to track my order 12345 that was supposed to arrive yesterday"
+
+
+def profile_sections(user_query: str, intents_data: dict) -> List[Dict]:
+    """
+    Token and byte counts per prompt section, in prompt order of first appearance.
+    """
+    totals: Dict[str, Dict] = {}
+    for name, text in nlu_prompt_sections(user_query, intents_data):
+        entry = totals.setdefault(name, {"section": name, "tokens": 0, "bytes": 0})
+        entry["tokens"] += count_tokens(text)
+        entry["bytes"] += len(text.encode("utf-8"))
+    return list(totals.values())
+
+
+def time_sections(
+    user_query: str,
+    intents_data: dict,
+    backend: str = "stub",
+    model: Optional[str] = None,
+    repeats: int = 3,
+    stub_ms_per_token: float = 0.5,
+    host: Optional[str] = None,
+) -> Dict[str, float]:
+    """
+    Median prompt-evaluation milliseconds attributed to each section.
+    """
+    pieces = nlu_prompt_sections(user_query, intents_data)
+    samples: Dict[str, List[float]] = {name: [] for name, _ in pieces}
+
+    for _ in range(repeats):
+        per_section: Dict[str, float] = {name: 0.0 for name, _ in pieces}
+        previous_ms = 0.0
+        prefix = ""
+        for name, text in pieces:
+            prefix += text
+            if backend == "ollama":
+                # New nonce per request, or the next prefix would reuse the previous one's KV cache
+                nonce = f"[{uuid.uuid4().hex[:8]}]\n"
+                response = ollama_client.generate(model, nonce + prefix, options={"num_predict": 1}, host=host)
+                elapsed_ms = response.get("prompt_eval_duration", 0) / 1e6
+            else:
+                elapsed_ms = count_tokens(prefix) * stub_ms_per_token
+            per_section[name] += max(0.0, elapsed_ms - previous_ms)
+            previous_ms = elapsed_ms
+        for name, value in per_section.items():
+            samples[name].append(value)
+
+    return {name: percentile(values, 50) for name, values in samples.items()}
+
+
+def template_tokens(intents_data: dict) -> int:
+    """Prompt tokens excluding the user query."""
+    return sum(row["tokens"] for row in profile_sections("", intents_data) if row["section"] != "user_query")
+
+
+def main():
+    config = load_config()
+    budget_config = config.get("prompt_budget", {})
+
+    parser = argparse.ArgumentParser(description="Profile NLU prompt size and evaluation cost per section")
+    parser.add_argument("--intents", default="data/raw_data/intents.json")
+    parser.add_argument("--query", default=SAMPLE_QUERY)
+    parser.add_argument("--backend", choices=["none", "stub", "ollama"], default="none", help="How to time prompt evaluation")
+    parser.add_argument("--model", default=config.get("ollama", {}).get("model_name", "gemma3"))
+    parser.add_argument("--host", default=None, help="Ollama base URL")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--stub-ms-per-token", type=float, default=0.5)
+    parser.add_argument("--budget", type=int, default=budget_config.get("max_template_tokens", 1200),
+                        help="Maximum prompt tokens excluding the user query")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 when over budget")
+    args = parser.parse_args()
+
+    intents_data = load_intents(args.intents)
+    rows = profile_sections(args.query, intents_data)
+    timings = {}
+    if args.backend != "none":
+        timings = time_sections(args.query, intents_data, args.backend, args.model, args.repeats, args.stub_ms_per_token, args.host)
+
+    total_tokens = sum(row["tokens"] for row in rows)
+    total_bytes = sum(row["bytes"] for row in rows)
+    print(f"NLU prompt profile ({len(intents_data['intents'])} intents, {len(intents_data.get('entities', {}))} entity types)")
+    header = f"{'section':<16}{'tokens':>8}{'share':>8}{'bytes':>8}"
+    print(header + (f"{'eval ms':>10}" if timings else ""))
+    for row in rows:
+        line = f"{row['section']:<16}{row['tokens']:>8}{row['tokens'] / total_tokens:>8.1%}{row['bytes']:>8}"
+        if timings:
+            line += f"{timings[row['section']]:>10.1f}"
+        print(line)
+    total_line = f"{'total':<16}{total_tokens:>8}{'':>8}{total_bytes:>8}"
+    if timings:
+        total_line += f"{sum(timings.values()):>10.1f}"
+    print(total_line)
+
+    template = template_tokens(intents_data)
+    status = "OK" if template <= args.budget else "OVER BUDGET"
+    print(f"\nTemplate tokens (without query): {template} / budget {args.budget} -> {status}")
+
+    if args.check and template > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Rate Limiter
+------------
+Client-side pacing for quota-limited APIs (e.g. Gemini).
+
+Each (API key, model) pair gets one shared limiter combining a token
+bucket (requests per minute), a cap on in-flight requests, and a global
+pause that is triggered when the server answers 429, so every thread
+backs off together instead of hammering an exhausted quota.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at `rate` tokens per second.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0):
+        """
+        Block until `tokens` are available, then take them.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def drain(self):
+        """Empty the bucket, e.g. after the server reported quota exhaustion."""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+
+
+class RateLimiter:
+    """
+    Requests-per-minute pacing plus a concurrency cap for one quota.
+    """
+
+    def __init__(self, requests_per_minute: float, max_concurrency: int = 4, burst: Optional[int] = None):
+        self.requests_per_minute = requests_per_minute
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst or max(1, max_concurrency))
+        self._in_flight = threading.BoundedSemaphore(max_concurrency)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self):
+        """
+        Wait for a free in-flight slot, any active back-off pause, and a token.
+        """
+        self._in_flight.acquire()
+        try:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+            self.bucket.acquire()
+            yield
+        finally:
+            self._in_flight.release()
+
+    def pause(self, seconds: float):
+        """
+        Hold back all callers for `seconds` after a 429.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.bucket.drain()
+
+
+_LIMITERS: Dict[Tuple[str, str], RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(api_key: str, model_name: str, requests_per_minute: float, max_concurrency: int = 4) -> RateLimiter:
+    """
+    Return the process-wide limiter for an (API key, model) quota.
+    """
+    key = (hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16], model_name)
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_minute, max_concurrency)
+            _LIMITERS[key] = limiter
+        return limiter
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    True for HTTP 429 / quota exhaustion errors from Google API clients.
+    """
+    if getattr(error, "code", None) == 429:
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return "429" in text or "resourceexhausted" in text or "resource exhausted" in text or "quota" in text
+
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 60.0) -> float:
+    """
+    Exponential back-off with full jitter: uniform(0, min(max_delay, base * 2^attempt)).
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_retry(
+    fn: Callable,
+    limiter: RateLimiter,
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+):
+    """
+    Call fn inside a limiter slot, retrying 429s with jittered back-off.
+    Non rate-limit errors and the final 429 are re-raised.
+    """
+    attempt = 0
+    while True:
+        try:
+            with limiter.slot():
+                return fn()
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            limiter.pause(delay)
+            attempt += 1
@@ -0,0 +1,136 @@
+"""
+Shared Store
+------------
+SQLite-backed key/value store shared by every worker process on a host.
+Used for prediction caches, evaluation job leases and other state that
+must survive across uvicorn/gunicorn workers.
+
+SQLite runs in WAL mode so readers never block the single writer, and
+each thread keeps its own connection.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_DB_PATH = Path("logs/shared_state.db")
+
+
+def prediction_cache_key(
+    model_name: str,
+    temperature: Optional[float],
+    schema_version: str,
+    message: str,
+    model_version: str = "",
+) -> str:
+    """
+    Cache key for a prediction; includes the schema version so edits invalidate
+    it, and the model version (e.g. a retrained distilled model) likewise.
+    """
+    raw = f"{model_name}|{model_version}|{temperature}|{schema_version}|{message}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SharedStore:
+    """
+    Namespaced key/value store with optional expiry.
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, busy_timeout: float = 5.0):
+        self.db_path = Path(db_path)
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS kv (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            self.delete(namespace, key)
+            return None
+        return json.loads(value)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        self._connection().execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, json.dumps(value, ensure_ascii=False), expires_at, now),
+        )
+
+    def delete(self, namespace: str, key: str):
+        self._connection().execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def clear(self, namespace: str):
+        self._connection().execute("DELETE FROM kv WHERE namespace = ?", (namespace,))
+
+    def purge_expired(self) -> int:
+        cursor = self._connection().execute(
+            "DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+        )
+        return cursor.rowcount
+
+    def acquire(self, namespace: str, key: str, owner: str, ttl: float) -> bool:
+        """
+        Take a lease on a key, e.g. so only one worker drives an evaluation run.
+        Succeeds if the key is free, expired, or already held by the same owner.
+        """
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is not None and json.loads(row[0]) != owner and (row[1] is None or row[1] >= now):
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(owner), now + ttl, now),
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def release(self, namespace: str, key: str, owner: str):
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is not None and json.loads(row[0]) == owner:
+            self.delete(namespace, key)
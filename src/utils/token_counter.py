@@ -0,0 +1,73 @@
+"""
+Token Counter
+-------------
+Lightweight, dependency-free token estimation for prompt budgeting.
+Local LLMs (Gemma, Qwen) use SentencePiece/BPE vocabularies that split
+words into sub-word pieces, so we approximate that by counting words and
+punctuation and charging long words one token per few characters.
+"""
+
+import math
+import re
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+# Average characters per sub-word piece for English-like text
+CHARS_PER_TOKEN = 4
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a piece of text.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        int: Approximate token count
+    """
+    if not text:
+        return 0
+
+    total = 0
+    for piece in _PIECE_RE.findall(text):
+        total += max(1, math.ceil(len(piece) / CHARS_PER_TOKEN))
+    return total
+
+
+def truncate_to_tokens(text: str, max_tokens: int, keep: str = "end") -> str:
+    """
+    Cut text so that it fits within max_tokens.
+
+    Args:
+        text (str): Input text
+        max_tokens (int): Token budget
+        keep (str): "end" keeps the tail of the text, "start" keeps the head
+
+    Returns:
+        str: Text fitting within the budget
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    pieces = list(_PIECE_RE.finditer(text))
+    ordered = reversed(pieces) if keep == "end" else pieces
+
+    used = 0
+    boundary = None
+    for match in ordered:
+        cost = max(1, math.ceil(len(match.group()) / CHARS_PER_TOKEN))
+        if used + cost > max_tokens:
+            break
+        used += cost
+        boundary = match
+
+    if boundary is None:
+        # A single piece (e.g. a pasted ID or blob) is over budget: cut it by characters
+        chars = max_tokens * CHARS_PER_TOKEN
+        return text[-chars:] if keep == "end" else text[:chars]
+    if keep == "end":
+        return text[boundary.start():]
+    return text[:boundary.end()]
@@ -0,0 +1,20 @@
+from src.utils.long_input import compress_long_input
+from src.utils.token_counter import CHARS_PER_TOKEN, count_tokens, truncate_to_tokens
+
+
+def test_truncate_slices_a_single_oversized_piece():
+    text = "Q" * 6000
+    assert truncate_to_tokens(text, 10, keep="end") == "Q" * (10 * CHARS_PER_TOKEN)
+    assert truncate_to_tokens(text, 10, keep="start") == "Q" * (10 * CHARS_PER_TOKEN)
+
+
+def test_truncate_keeps_whole_pieces_when_they_fit():
+    assert truncate_to_tokens("where is my order 12345", 4, keep="end") == "order 12345"
+
+
+def test_compress_never_returns_empty_for_long_blob():
+    text = "My order failed with this token, what does it mean? " + "Q" * 6000
+    processed, info = compress_long_input(text, 256)
+    assert processed.strip()
+    assert info["compressed"]
+    assert count_tokens(processed) <= 256